@@ -4,10 +4,30 @@ connect_blockchain_module module for token management.
 This module provides functionality for implementing token management functionality.
 """
 import logging
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from base58 import b58decode, b58encode
+except ImportError:
+    # Newer solana-py releases depend on based58 instead of base58
+    from based58 import b58decode, b58encode
+
+from cachetools import LRUCache
+from solana.keypair import Keypair
+from solana.publickey import PublicKey
+from solana.rpc.types import TxOpts
+
+from ..utils.blockchain import SolanaConnection
+from ..utils.quic_submitter import AIOQUIC_AVAILABLE, QuicTransactionSubmitter
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of (sender, recipient) transfer messages kept as templates
+TX_TEMPLATE_CACHE_SIZE = 1024
+# Seconds a fetched blockhash is reused; well inside its ~60s validity window
+BLOCKHASH_TTL = 20.0
+
 
 class ConnectBlockchainModule:
     """
@@ -16,14 +36,23 @@ class ConnectBlockchainModule:
     This class implements functionality for implementing token management functionality.
     """
     
-    def __init__(self, config: Optional[Dict] = None):
+    def __init__(self,
+                 config: Optional[Dict] = None,
+                 connection: Optional[SolanaConnection] = None):
         """Initialize the ConnectBlockchainModule."""
         self.config = config or {}
-        logger.info(f"ConnectBlockchainModule initialized with config: {self.config}")
+        self.connection = connection
+        self.quic_submitter = _create_quic_submitter(self.config)
+        self._tx_template_cache: "LRUCache[Tuple[bytes, bytes], bytes]" = LRUCache(
+            maxsize=TX_TEMPLATE_CACHE_SIZE
+        )
+        # (raw blockhash, monotonic fetch time) shared by consecutive transfers
+        self._blockhash: Optional[Tuple[bytes, float]] = None
+        logger.info("ConnectBlockchainModule initialized with config: %s", self.config)
     
     def process(self, data: Dict) -> Dict:
         """Process the input data."""
-        logger.info(f"Processing data: {data}")
+        logger.info("Processing data: %s", data)
         # Implementation goes here
         result = {"status": "success", "data": data}
         return result
@@ -33,111 +62,120 @@ class ConnectBlockchainModule:
         """Validate the input data."""
         # Validation logic here
         return True
-
-     def transfer(self, 
-                recipient: PublicKey, 
-                amount: int, 
-                sender: Optional[Keypair] = None) -> Optional[str]:
-        """Transfer SOL to the recipient."""
+    
+    def transfer(self,
+                 recipient: PublicKey,
+                 amount: int,
+                 sender: Optional[Keypair] = None) -> Optional[str]:
+        """
+        Transfer SOL to the recipient.
+        
+        Returns the transaction signature as soon as the transaction has been
+        submitted, over QUIC when configured or via sendTransaction otherwise
+        (including when QUIC delivery fails).
+        The signature is unconfirmed: the transaction may still be dropped, so
+        callers that need it to land must confirm it themselves.
+        """
+        if self.connection is None:
+            raise ValueError("No Solana connection configured")
         if sender is None:
-            if self.keypair is None:
+            if self.connection.keypair is None:
                 raise ValueError("No keypair loaded")
-            sender = self.keypair
-        
-        transaction = Transaction()
-        transaction.add(
-            SYS_PROGRAM_ID.transfer(
-                TransferParams(
-                    from_pubkey=sender.public_key,
-                    to_pubkey=recipient,
-                    lamports=amount
-                )
-            )
-        )
+            sender = self.connection.keypair
         
         try:
-            resp = self.client.send_transaction(
-                transaction,
-                sender,
-                opts=TxOpts(skip_preflight=False, preflight_commitment=self.config.commitment)
+            tx_bytes, signature = self._serialize_transfer(recipient, amount, sender)
+            
+            if self.quic_submitter is not None:
+                try:
+                    self.quic_submitter.submit(tx_bytes)
+                    return signature
+                except Exception as e:
+                    logger.warning("QUIC submission failed, falling back to RPC: %s", e)
+                    # Resend the same bytes so a transfer QUIC did deliver can't land twice
+                    self._blockhash = None
+            
+            resp = self.connection.client.send_raw_transaction(
+                tx_bytes,
+                opts=TxOpts(skip_preflight=False, preflight_commitment=self.connection.config.commitment)
             )
             
             if "result" in resp:
                 return resp["result"]
             else:
-                logger.error(f"Error sending transaction: {resp}")
+                logger.error("Error sending transaction: %s", resp)
+                self._blockhash = None
                 return None
         except Exception as e:
-            logger.exception(f"Error sending transaction: {str(e)}")
+            logger.exception("Error sending transaction: %s", e)
+            self._blockhash = None
             return None
-
-
-class MCPTokenClient:
-    """Client for interacting with the MCP token program."""
-    
-    def __init__(self, 
-                 connection: SolanaConnection,
-                 program_id: PublicKey,
-                 token_mint: PublicKey):
-        self.connection = connection
-        self.program_id = program_id
-        self.token_mint = token_mint
     
-    def mint_tokens(self, recipient: PublicKey, amount: int) -> Optional[str]:
-        """Mint MCP tokens to the recipient."""
-        # Implementation would depend on the specific Solana program structure
-        # This is a placeholder for the actual implementation
-        logger.info(f"Minting {amount} tokens to {recipient}")
-        return "tx_signature_placeholder"
+    def _recent_blockhash(self) -> bytes:
+        """Get a recent blockhash, refetching it once BLOCKHASH_TTL has passed."""
+        cached = self._blockhash
+        now = time.monotonic()
+        if cached is not None and now - cached[1] < BLOCKHASH_TTL:
+            return cached[0]
+        blockhash = b58decode(self.connection.get_latest_blockhash().encode("ascii"))
+        self._blockhash = (blockhash, now)
+        return blockhash
     
-    def transfer_tokens(self, 
-                       recipient: PublicKey, 
-                       amount: int,
-                       sender: Optional[Keypair] = None) -> Optional[str]:
-        """Transfer MCP tokens to the recipient."""
-        # Implementation would depend on the specific Solana program structure
-        # This is a placeholder for the actual implementation
-        if sender is None:
-            if self.connection.keypair is None:
-                raise ValueError("No keypair loaded")
-            sender = self.connection.keypair
+    def _serialize_transfer(self,
+                            recipient: PublicKey,
+                            amount: int,
+                            sender: Keypair) -> Tuple[bytes, str]:
+        """
+        Build a signed transfer in wire format.
         
-        logger.info(f"Transferring {amount} tokens from {sender.public_key} to {recipient}")
-        return "tx_signature_placeholder"
+        The compiled message for each (sender, recipient) pair is cached; later
+        transfers copy it and patch only the recent blockhash and the trailing
+        8-byte little-endian lamports field before signing. The blockhash is
+        itself reused for BLOCKHASH_TTL seconds.
+        """
+        blockhash = self._recent_blockhash()
+        key = (bytes(sender.public_key), bytes(recipient))
+        template = self._tx_template_cache.get(key)
+        if template is None:
+            transaction = SolanaConnection.build_transfer_transaction(recipient, 0, sender)
+            transaction.fee_payer = sender.public_key
+            transaction.recent_blockhash = b58encode(blockhash).decode("ascii")
+            template = transaction.serialize_message()
+            self._tx_template_cache[key] = template
+        
+        message = bytearray(template)
+        # Header (3 bytes) and account count precede the 32-byte account keys
+        blockhash_offset = 4 + 32 * message[3]
+        message[blockhash_offset:blockhash_offset + 32] = blockhash
+        message[-8:] = amount.to_bytes(8, "little")
+        
+        signature = sender.sign(bytes(message)).signature
+        return b"\x01" + signature + bytes(message), b58encode(signature).decode("ascii")
+    
+    def close(self) -> None:
+        """Release the QUIC connection, if any."""
+        if self.quic_submitter is not None:
+            self.quic_submitter.close()
+            self.quic_submitter = None
 
 
-class ModelRegistryClient:
-    """Client for interacting with the AI model registry program."""
-    
-    def __init__(self, 
-                 connection: SolanaConnection,
-                 program_id: PublicKey):
-        self.connection = connection
-        self.program_id = program_id
-    
-    def register_model(self, 
-                      model_id: str, 
-                      model_data: Dict[str, Any]) -> Optional[str]:
-        """Register a new AI model in the registry."""
-        # Implementation would depend on the specific Solana program structure
-        # This is a placeholder for the actual implementation
-        logger.info(f"Registering model {model_id}")
-        return "tx_signature_placeholder"
-    
-    def get_model_data(self, model_id: str) -> Optional[Dict[str, Any]]:
-        """Get data for a registered AI model."""
-        # Implementation would depend on the specific Solana program structure
-        # This is a placeholder for the actual implementation
-        logger.info(f"Getting data for model {model_id}")
-        return {"model_id": model_id, "status": "active"}
+def _create_quic_submitter(config: Dict) -> Optional[QuicTransactionSubmitter]:
+    """Create a QUIC submitter from the ``quic_endpoints`` config entry, if present."""
+    endpoints = config.get("quic_endpoints")
+    if not endpoints:
+        return None
+    if not AIOQUIC_AVAILABLE:
+        logger.warning("QUIC endpoints configured but aioquic is not available. Using RPC.")
+        return None
     
-    def list_models(self) -> List[Dict[str, Any]]:
-        """List all registered AI models."""
-        # Implementation would depend on the specific Solana program structure
-        # This is a placeholder for the actual implementation
-        logger.info("Listing all models")    
+    return QuicTransactionSubmitter(
+        [(host, int(port)) for host, port in endpoints],
+        certificate_path=config.get("quic_certificate_path"),
+        private_key_path=config.get("quic_private_key_path"),
+    )
 
 
-def create_connect_blockchain_module(config: Dict) -> ConnectBlockchainModule:
+def create_connect_blockchain_module(config: Dict,
+                                     connection: Optional[SolanaConnection] = None) -> ConnectBlockchainModule:
     """Create a new ConnectBlockchainModule instance with the given config."""
-    return ConnectBlockchainModule(config)
+    return ConnectBlockchainModule(config, connection)
@@ -4,18 +4,31 @@ Sample language model implementation using MCP.
 This module provides a concrete implementation of the AI model
 interface for language processing.
 """
+import copy
 import json
 import logging
+import threading
 import time
-from typing import Any, Dict, List, Optional, Union
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 
 from ..mcp.model_context import ContextMetadata, ContextType, ModelContext, ModelType
 from .model_manager import AIModel, ModelInfo, ModelStatus
+from .weight_prefetch import prefetch_pretrained
 
 logger = logging.getLogger(__name__)
 
+# Shared immutable tags for every output context
+OUTPUT_TAGS = ("generated", "language-model")
+
+# Generation settings
+MAX_NEW_TOKENS = 100
+# Prompts sharing their first PREFIX_CACHE_TOKENS tokens reuse one KV cache
+PREFIX_CACHE_TOKENS = 32
+PREFIX_CACHE_SIZE = 64
+
 try:
     import torch
     from transformers import AutoModelForCausalLM, AutoTokenizer
@@ -41,12 +54,20 @@ class LanguageModel(AIModel):
     # Modified: 2025-04-26T22:17:16.975506
                 model_info: ModelInfo, 
                 model_name: str = "gpt2",
-                device: str = "cpu"):
+                device: str = "cpu",
+                compile_model: bool = False,
+                lazy_load: bool = True):
         super().__init__(model_info)
         self.model_name = model_name
         self.device = device
-        self.model = None
+        self.compile_model = compile_model
+        self.lazy_load = lazy_load
         self.tokenizer = None
+        self._model = None
+        self._load_enabled = False
+        self._load_lock = threading.RLock()
+        self._kv_cache: "OrderedDict[Tuple[int, ...], Any]" = OrderedDict()
+        self._kv_cache_lock = threading.Lock()
     
     def initialize(self) -> bool:
         """Initialize the language model."""
@@ -55,62 +76,163 @@ class LanguageModel(AIModel):
             time.sleep(2)  # Simulate model loading time
             return True
         
-        try:
-            logger.info(f"Loading language model {self.model_name}")
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.model = AutoModelForCausalLM.from_pretrained(self.model_name)
-            self.model.to(self.device)
+        self._load_enabled = True
+        if self.lazy_load:
             return True
+        
+        try:
+            return self.model is not None
         except Exception as e:
-            logger.exception(f"Error loading language model: {str(e)}")
+            logger.exception("Error loading language model: %s", e)
             return False
     
+    @property
+    def model(self):
+        """The underlying transformers model, loaded on first access after initialize()."""
+        if self._model is None and self._load_enabled:
+            with self._load_lock:
+                if self._model is None:
+                    self._load_model()
+        return self._model
+    
+    @model.setter
+    def model(self, value) -> None:
+        self._model = value
+    
+    def _load_model(self) -> None:
+        """Load the tokenizer and weights."""
+        logger.info("Loading language model %s", self.model_name)
+        prefetch_pretrained(self.model_name)
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        # Decoder-only models generate after the prompt, so pad on the left
+        tokenizer.padding_side = "left"
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        
+        # low_cpu_mem_usage maps weights in instead of materializing a random init first
+        model = AutoModelForCausalLM.from_pretrained(self.model_name, low_cpu_mem_usage=True)
+        model.to(self.device)
+        model.eval()
+        # Off by default: the dynamic KV cache grows every decoding step, so a
+        # compiled forward keeps recompiling and re-recording CUDA graphs
+        if self.compile_model and hasattr(torch, "compile"):
+            try:
+                model.forward = torch.compile(model.forward, mode="reduce-overhead")
+            except Exception as e:
+                logger.warning("torch.compile unavailable, running eagerly: %s", e)
+        
+        self.tokenizer = tokenizer
+        self._model = model
+    
     def run(self, context: ModelContext) -> ModelContext:
         """Run the language model on the given context."""
-        if context.context_type != ContextType.TEXT:
-            raise ValueError(f"Unsupported context type: {context.context_type.value}")
+        return self.run_batch([context])[0]
+    
+    def run_batch(self, contexts: List[ModelContext]) -> List[ModelContext]:
+        """Run the language model on several contexts with a single generate call."""
+        for context in contexts:
+            if context.context_type != ContextType.TEXT:
+                raise ValueError(f"Unsupported context type: {context.context_type.value}")
         
-        input_text = context.data
-        logger.info(f"Running language model on input: {input_text[:50]}...")
+        # One clock read stamps every output and the model's last run time
+        now = time.time()
+        input_texts = [context.data for context in contexts]
+        if logger.isEnabledFor(logging.INFO):
+            for input_text in input_texts:
+                logger.info("Running language model on input: %s...", input_text[:50])
         
         if not TRANSFORMERS_AVAILABLE or self.model is None:
             # Mock implementation for testing
             logger.warning("Using mock language model generation.")
-            output_text = f"Response to: {input_text[:20]}... (mock output)"
+            output_texts = [
+                f"Response to: {input_text[:20]}... (mock output)"
+                for input_text in input_texts
+            ]
             time.sleep(1)  # Simulate processing time
+        elif len(input_texts) == 1:
+            output_texts = [self._generate_with_prefix_cache(input_texts[0])]
         else:
-            # Actual model inference
-            input_ids = self.tokenizer.encode(input_text, return_tensors="pt").to(self.device)
+            # Actual model inference on a left-padded batch
+            batch = self.tokenizer(input_texts, padding=True, return_tensors="pt").to(self.device)
             output_ids = self.model.generate(
-                input_ids,
-                max_length=100,
+                **batch,
+                max_new_tokens=MAX_NEW_TOKENS,
                 temperature=0.7,
                 top_p=0.9,
                 do_sample=True,
+                use_cache=True,
+                pad_token_id=self.tokenizer.pad_token_id,
             )
-            output_text = self.tokenizer.decode(output_ids[0], skip_special_tokens=True)
+            output_texts = self.tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+        
+        self.update_last_run_time(now)
+        return [
+            self._create_output_context(context, output_text, now)
+            for context, output_text in zip(contexts, output_texts)
+        ]
+    
+    def _generate_with_prefix_cache(self, input_text: str) -> str:
+        """Generate for a single prompt, reusing the KV cache of a previously seen prefix."""
+        input_ids = self.tokenizer.encode(input_text, return_tensors="pt").to(self.device)
+        generate_kwargs = {}
         
-        # Create output context
-        output_metadata = ContextMetadata(
-            creation_time=time.time(),
+        if input_ids.shape[1] > PREFIX_CACHE_TOKENS:
+            prefix = tuple(input_ids[0, :PREFIX_CACHE_TOKENS].tolist())
+            with self._kv_cache_lock:
+                past_key_values = self._kv_cache.get(prefix)
+                if past_key_values is not None:
+                    self._kv_cache.move_to_end(prefix)
+            if past_key_values is None:
+                # Computed outside the lock; a concurrent miss on the same prefix just recomputes it
+                with torch.no_grad():
+                    past_key_values = self.model(
+                        input_ids[:, :PREFIX_CACHE_TOKENS],
+                        use_cache=True
+                    ).past_key_values
+                with self._kv_cache_lock:
+                    self._kv_cache[prefix] = past_key_values
+                    if len(self._kv_cache) > PREFIX_CACHE_SIZE:
+                        self._kv_cache.popitem(last=False)
+            # generate extends the cache in place, so hand it a copy
+            generate_kwargs["past_key_values"] = copy.deepcopy(past_key_values)
+        
+        output_ids = self.model.generate(
+            input_ids,
+            attention_mask=torch.ones_like(input_ids),
+            max_new_tokens=MAX_NEW_TOKENS,
+            temperature=0.7,
+            top_p=0.9,
+            do_sample=True,
+            use_cache=True,
+            pad_token_id=self.tokenizer.pad_token_id,
+            **generate_kwargs
+        )
+        return self.tokenizer.decode(output_ids[0], skip_special_tokens=True)
+    
+    def _create_output_context(self, context: ModelContext, output_text: str,
+                               creation_time: float) -> ModelContext:
+        """Wrap generated text in an output context."""
+        output_metadata = self._new_context_object(
+            ContextMetadata,
+            creation_time=creation_time,
             source=f"language_model:{self.model_name}",
             version="1.0",
             content_type="text/plain",
-            tags=["generated", "language-model"]
+            tags=OUTPUT_TAGS
         )
         
-        output_context = ModelContext(
+        return self._new_context_object(
+            ModelContext,
             context_id=f"{context.context_id}_response",
             context_type=ContextType.TEXT,
             data=output_text,
             metadata=output_metadata,
             model_type=ModelType.LANGUAGE
         )
-        
-        return output_context
 
 
-def create_default_language_model(model_id: str = "default_language_model") -> LanguageModel:
+def create_default_language_model(model_id: str = "default_language_model",
+                                  lazy_load: bool = True) -> LanguageModel:
     """Create a default language model instance."""
     model_info = ModelInfo(
         model_id=model_id,
@@ -127,4 +249,4 @@ def create_default_language_model(model_id: str = "default_language_model") -> L
         }
     )
     
-    return LanguageModel(model_info, model_name="gpt2") 
\ No newline at end of file
+    return LanguageModel(model_info, model_name="gpt2", lazy_load=lazy_load) 
\ No newline at end of file
@@ -7,15 +7,25 @@ AI models within the MCP framework.
 import json
 import logging
 import os
+import threading
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional, Type, TypeVar, Union
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple, Type, TypeVar, Union
 
 import numpy as np
 
-from ..mcp.model_context import ContextType, ModelContext, ModelType
+from ..mcp.model_context import (
+    CONTEXT_TYPES_BY_VALUE,
+    MODEL_TYPES_BY_VALUE,
+    ContextPool,
+    ContextType,
+    ModelContext,
+    ModelType,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +40,12 @@ class ModelStatus(Enum):
     STOPPED = "stopped"
 
 
+MODEL_STATUSES_BY_VALUE: Dict[str, ModelStatus] = {member.value: member for member in ModelStatus}
+
+# Statuses in which a model accepts runs; RUNNING admits concurrent callers
+RUNNABLE_STATUSES = frozenset({ModelStatus.READY, ModelStatus.RUNNING})
+
+
 @dataclass
 class ModelInfo:
     """Information about an AI model."""
@@ -67,10 +83,10 @@ class ModelInfo:
             model_id=data["model_id"],
             name=data["name"],
             version=data["version"],
-            model_type=ModelType(data["model_type"]),
+            model_type=MODEL_TYPES_BY_VALUE[data["model_type"]],
             description=data["description"],
-            supported_context_types=[ContextType(ct) for ct in data["supported_context_types"]],
-            status=ModelStatus(data["status"]),
+            supported_context_types=[CONTEXT_TYPES_BY_VALUE[ct] for ct in data["supported_context_types"]],
+            status=MODEL_STATUSES_BY_VALUE[data["status"]],
             metadata=data.get("metadata", {}),
         )
 
@@ -84,6 +100,10 @@ class AIModel(ABC):
     def __init__(self, model_info: ModelInfo):
         self.model_info = model_info
         self._last_run_time = 0.0
+        # When set, output contexts are drawn from this pool and callers release them
+        self.context_pool: Optional[ContextPool] = None
+        # Set by the owning ModelManager so status changes refresh its run snapshot
+        self._on_status_change: Optional[Callable[[str], None]] = None
     
     @abstractmethod
     def initialize(self) -> bool:
@@ -95,6 +115,18 @@ class AIModel(ABC):
         """Run the model on the given context."""
         pass
     
+    def run_batch(self, contexts: List[ModelContext]) -> List[ModelContext]:
+        """Run the model on several contexts. Subclasses override this to batch inference."""
+        results = [self.run(context) for context in contexts]
+        self.update_last_run_time()
+        return results
+    
+    def _new_context_object(self, cls, **values):
+        """Create an output ModelContext or ContextMetadata, reusing a pooled instance if configured."""
+        if self.context_pool is None:
+            return cls(**values)
+        return self.context_pool.acquire(cls, **values)
+    
     @property
     def model_id(self) -> str:
         """Get the model ID."""
@@ -108,16 +140,20 @@ class AIModel(ABC):
     @status.setter
     def status(self, value: ModelStatus) -> None:
         """Set the current status of the model."""
+        # Only readiness is published, so READY <-> RUNNING per run stays off the snapshot lock
+        changed = (self.model_info.status in RUNNABLE_STATUSES) != (value in RUNNABLE_STATUSES)
         self.model_info.status = value
+        if changed and self._on_status_change is not None:
+            self._on_status_change(self.model_id)
     
     @property
     def last_run_time(self) -> float:
         """Get the last time the model was run."""
         return self._last_run_time
     
-    def update_last_run_time(self) -> None:
-        """Update the last run time to now."""
-        self._last_run_time = time.time()
+    def update_last_run_time(self, timestamp: Optional[float] = None) -> None:
+        """Update the last run time to the given wall-clock timestamp, or to now."""
+        self._last_run_time = time.time() if timestamp is None else timestamp
     
     def supports_context_type(self, context_type: ContextType) -> bool:
         """Check if the model supports the given context type."""
@@ -129,10 +165,40 @@ class ModelManager:
     Manager for AI models.
     
     Provides functionality to register, initialize, and run AI models.
+    
+    ``run_model`` reads an immutable snapshot of ``(model, supported context
+    types, ready)`` per model, which is rebuilt and swapped in whenever a model
+    is registered, unregistered or its status setter changes readiness. Model
+    lookup therefore takes no lock; concurrent runs of the same model rely on
+    the model itself being thread-safe.
     """
     
-    def __init__(self):
+    def __init__(self, max_init_workers: int = 4):
         self._models: Dict[str, AIModel] = {}
+        self._max_init_workers = max_init_workers
+        self._init_executor: Optional[ThreadPoolExecutor] = None
+        self._snapshot: Mapping[str, Tuple[AIModel, FrozenSet[ContextType], bool]] = MappingProxyType({})
+        self._snapshot_lock = threading.Lock()
+    
+    def _publish(self, model_id: str) -> None:
+        """Rebuild the run snapshot entry for a model and swap in the new snapshot."""
+        with self._snapshot_lock:
+            model = self._models.get(model_id)
+            entry = self._snapshot.get(model_id)
+            if model is not None and entry is not None and entry[0] is model \
+                    and entry[2] == (model.status in RUNNABLE_STATUSES):
+                # READY <-> RUNNING leaves the published entry unchanged
+                return
+            snapshot = dict(self._snapshot)
+            if model is None:
+                snapshot.pop(model_id, None)
+            else:
+                snapshot[model_id] = (
+                    model,
+                    frozenset(model.model_info.supported_context_types),
+                    model.status in RUNNABLE_STATUSES,
+                )
+            self._snapshot = MappingProxyType(snapshot)
     
     def register_model(self, model: AIModel) -> bool:
         """Register a new model."""
@@ -141,6 +207,8 @@ class ModelManager:
             return False
         
         self._models[model.model_id] = model
+        model._on_status_change = self._publish
+        self._publish(model.model_id)
         return True
     
     def initialize_model(self, model_id: str) -> bool:
@@ -162,29 +230,57 @@ class ModelManager:
             model.status = ModelStatus.ERROR
             return False
     
-    def run_model(self, model_id: str, context: ModelContext) -> Optional[ModelContext]:
-        """Run a model on the given context."""
-        model = self._models.get(model_id)
-        if not model:
+    def initialize_model_async(self, model_id: str) -> "Future[bool]":
+        """Initialize a registered model on a background thread."""
+        if self._init_executor is None:
+            self._init_executor = ThreadPoolExecutor(
+                max_workers=self._max_init_workers,
+                thread_name_prefix="model-init"
+            )
+        return self._init_executor.submit(self.initialize_model, model_id)
+    
+    def initialize_models(self, model_ids: Optional[List[str]] = None) -> Dict[str, bool]:
+        """Initialize several models concurrently, waiting for all of them."""
+        if model_ids is None:
+            model_ids = list(self._models)
+        futures = {model_id: self.initialize_model_async(model_id) for model_id in model_ids}
+        return {model_id: future.result() for model_id, future in futures.items()}
+    
+    def run_model(self,
+                  model_id: str,
+                  context: Union[ModelContext, List[ModelContext]]
+                  ) -> Optional[Union[ModelContext, List[ModelContext]]]:
+        """
+        Run a model on the given context.
+        
+        A list of contexts is run through the model's batch path and returns a
+        list of results.
+        """
+        entry = self._snapshot.get(model_id)
+        if entry is None:
             logger.error(f"Model with ID {model_id} not found.")
             return None
         
-        if model.status != ModelStatus.READY:
+        model, supported_context_types, ready = entry
+        if not ready:
             logger.error(f"Model {model_id} is not ready. Current status: {model.status.value}")
             return None
         
-        if not model.supports_context_type(context.context_type):
-            logger.error(
-                f"Model {model_id} does not support context type {context.context_type.value}"
-            )
-            return None
+        contexts = context if isinstance(context, list) else [context]
+        for ctx in contexts:
+            if ctx.context_type not in supported_context_types:
+                logger.error(
+                    f"Model {model_id} does not support context type {ctx.context_type.value}"
+                )
+                return None
         
         try:
             model.status = ModelStatus.RUNNING
-            result = model.run(context)
-            model.status = ModelStatus.READY
-            model.update_last_run_time()
-            return result
+            # run_batch records the last run time from the timestamp it stamps outputs with
+            result = model.run_batch(contexts)
+            if model.status == ModelStatus.RUNNING:
+                model.status = ModelStatus.READY
+            return result if isinstance(context, list) else result[0]
         except Exception as e:
             logger.exception(f"Error running model {model_id}: {str(e)}")
             model.status = ModelStatus.ERROR
@@ -206,7 +302,8 @@ class ModelManager:
     def unregister_model(self, model_id: str) -> bool:
         """Unregister a model."""
         if model_id in self._models:
-            del self._models[model_id]
+            self._models.pop(model_id)._on_status_change = None
+            self._publish(model_id)
             return True
         return False 
 
@@ -19,11 +19,11 @@ class ProcessContextModule:
     def __init__(self, config: Optional[Dict] = None):
         """Initialize the ProcessContextModule."""
         self.config = config or {}
-        logger.info(f"ProcessContextModule initialized with config: {self.config}")
+        logger.info("ProcessContextModule initialized with config: %s", self.config)
     
     def process(self, data: Dict) -> Dict:
         """Process the input data."""
-        logger.info(f"Processing data: {data}")
+        logger.info("Processing data: %s", data)
         # Implementation goes here
         result = {"status": "success", "data": data}
         return result
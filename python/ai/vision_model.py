@@ -5,30 +5,66 @@ This module provides a concrete implementation of the AI model
 interface for image processing.
 """
 import base64
+import contextlib
+import copy
 import io
 import json
 import logging
+import os
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from PIL import Image
 
 from ..mcp.model_context import ContextMetadata, ContextType, ModelContext, ModelType
 from .model_manager import AIModel, ModelInfo, ModelStatus
+from .weight_prefetch import prefetch_files
 
 logger = logging.getLogger(__name__)
 
+# Shared immutable tags for every output context
+OUTPUT_TAGS = ("inference", "vision-model", "classification")
+
+# Input resolution and ImageNet normalization constants
+IMAGE_SIZE = 224
+IMAGENET_MEAN = [0.485, 0.456, 0.406]
+IMAGENET_STD = [0.229, 0.224, 0.225]
+
+JPEG_MAGIC = b"\xff\xd8"
+
+# Number of calibration images used for INT8 quantization
+CALIBRATION_SAMPLES = 32
+# Contexts tagged with this run on the unquantized FP32 model
+FP32_TAG = "fp32"
+
 try:
     import torch
     import torchvision
+    from torchvision import transforms
+    from torchvision.io import ImageReadMode, decode_image, decode_jpeg
     from torchvision.models import ResNet50_Weights
-    from torchvision.transforms import functional as F
     TORCHVISION_AVAILABLE = True
 except ImportError:
     logger.warning("TorchVision library not available. Using mock implementation.")
     TORCHVISION_AVAILABLE = False
 
+try:
+    from turbojpeg import TJPF_RGB, TurboJPEG
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
+
+
+def _cpu_supports_bf16() -> bool:
+    """Whether the host CPU has native BF16 matmul support (AVX512-BF16 or AMX)."""
+    for name in ("_is_avx512_bf16_supported", "_is_amx_tile_supported"):
+        check = getattr(torch.cpu, name, None)
+        if check is not None and check():
+            return True
+    return False
+
 
 class VisionModel(AIModel):
     """
@@ -43,12 +79,36 @@ class VisionModel(AIModel):
     # Modified: 2025-04-26T22:17:31.882051
     # Modified: 2025-04-26T22:17:09.026297
                 model_name: str = "resnet50",
-                device: str = "cpu"):
+                device: str = "cpu",
+                mixed_precision: bool = True,
+                compile_model: bool = False,
+                quantize: bool = False,
+                calibration_data: Optional[Sequence[Union[str, bytes, np.ndarray]]] = None,
+                lazy_load: bool = True):
         super().__init__(model_info)
         self.model_name = model_name
         self.device = device
-        self.model = None
+        self.mixed_precision = mixed_precision
+        self.compile_model = compile_model
+        self.quantize = quantize
+        self.calibration_data = calibration_data
+        self.lazy_load = lazy_load
+        self.fp32_model = None
         self.class_labels = []
+        self._model = None
+        self._transform = None
+        self._autocast_dtype = None
+        self._compiled_model = None
+        self._load_enabled = False
+        self._load_lock = threading.RLock()
+        self._turbojpeg = None
+        self._turbojpeg_failed = False
+        # CUDA streams for overlapping host-to-device copies with inference
+        self._copy_stream = None
+        self._compute_stream = None
+        # Input loaders dispatched on the exact input type
+        self._loaders = {str: self._load_str, bytes: self._load_bytes, np.ndarray: self._load_ndarray}
+        self._decoders = {str: self._decode_str, bytes: self._decode_bytes, np.ndarray: self._decode_ndarray}
     
     def initialize(self) -> bool:
         """Initialize the vision model."""
@@ -58,24 +118,136 @@ class VisionModel(AIModel):
             self._load_mock_class_labels()
             return True
         
-        try:
-            logger.info(f"Loading vision model {self.model_name}")
-            
-            if self.model_name == "resnet50":
-                weights = ResNet50_Weights.DEFAULT
-                self.model = torchvision.models.resnet50(weights=weights)
-                self.model.eval()
-                self.model.to(self.device)
-                self.class_labels = weights.meta["categories"]
-            else:
-                logger.error(f"Unsupported model name: {self.model_name}")
-                return False
-                
+        if self.model_name != "resnet50":
+            logger.error("Unsupported model name: %s", self.model_name)
+            return False
+        
+        self._transform = transforms.Compose([
+            transforms.Resize([IMAGE_SIZE, IMAGE_SIZE], antialias=True),
+            transforms.ConvertImageDtype(torch.float32),
+            transforms.Normalize(mean=IMAGENET_MEAN, std=IMAGENET_STD),
+        ])
+        if torch.device(self.device).type == "cuda" and torch.cuda.is_available():
+            self._copy_stream = torch.cuda.Stream(device=self.device)
+            self._compute_stream = torch.cuda.Stream(device=self.device)
+        self._load_enabled = True
+        if self.lazy_load:
             return True
+        
+        try:
+            return self.model is not None
         except Exception as e:
-            logger.exception(f"Error loading vision model: {str(e)}")
+            logger.exception("Error loading vision model: %s", e)
             return False
     
+    @property
+    def model(self):
+        """The underlying TorchVision model, loaded on first access after initialize()."""
+        if self._model is None and self._load_enabled:
+            with self._load_lock:
+                if self._model is None:
+                    self._load_model()
+        return self._model
+    
+    @model.setter
+    def model(self, value) -> None:
+        self._model = value
+    
+    def _load_model(self) -> None:
+        """Load the weights and prepare the model for inference."""
+        logger.info("Loading vision model %s", self.model_name)
+        
+        weights = ResNet50_Weights.DEFAULT
+        try:
+            prefetch_files([
+                os.path.join(torch.hub.get_dir(), "checkpoints", os.path.basename(weights.url))
+            ])
+        except OSError as e:
+            logger.warning("Error prefetching weights for %s: %s", self.model_name, e)
+        model = torchvision.models.resnet50(weights=weights)
+        model.eval()
+        model.to(self.device)
+        self.class_labels = weights.meta["categories"]
+        self.fp32_model = model
+        self._model = model
+        
+        try:
+            if self.quantize:
+                self._quantize_model()
+            self._setup_fast_inference()
+        except Exception:
+            self._model = None
+            raise
+    
+    def _quantize_model(self) -> None:
+        """Replace the model with an INT8 post-training quantized copy for CPU inference."""
+        if torch.device(self.device).type != "cpu":
+            logger.warning("INT8 quantization is only supported on CPU. Keeping FP32 model.")
+            return
+        if not self.calibration_data:
+            logger.warning("No calibration data provided. Keeping FP32 model.")
+            return
+        
+        from torch.ao.quantization import get_default_qconfig_mapping
+        from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+        
+        torch.backends.quantized.engine = "fbgemm"
+        example_inputs = (torch.zeros(1, 3, IMAGE_SIZE, IMAGE_SIZE),)
+        prepared = prepare_fx(
+            copy.deepcopy(self.fp32_model),
+            get_default_qconfig_mapping("fbgemm"),
+            example_inputs
+        )
+        
+        with torch.no_grad():
+            for image_data in list(self.calibration_data)[:CALIBRATION_SAMPLES]:
+                image = self._decode_image(image_data)
+                if image is not None:
+                    prepared(self._preprocess_image(image))
+        
+        self.model = convert_fx(prepared)
+        logger.info("Quantized vision model %s to INT8", self.model_name)
+    
+    def _setup_fast_inference(self) -> None:
+        """Choose the autocast dtype and compile the model where supported."""
+        if self.model is not self.fp32_model:
+            # Quantized models already run in INT8
+            return
+        
+        device_type = torch.device(self.device).type
+        if self.mixed_precision:
+            if device_type == "cuda":
+                self._autocast_dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+            elif _cpu_supports_bf16():
+                self._autocast_dtype = torch.bfloat16
+            else:
+                # Emulated BF16 is slower than FP32 on CPUs without native support
+                logger.info("CPU lacks native BF16 support. Running in FP32.")
+        
+        # Off by default: batch sizes vary per call, so a compiled model keeps
+        # recompiling and re-recording CUDA graphs for each new shape
+        if self.compile_model and hasattr(torch, "compile"):
+            try:
+                self.model = torch.compile(self.model, mode="reduce-overhead")
+                self._compiled_model = self.model
+            except Exception as e:
+                logger.warning("torch.compile unavailable, running eagerly: %s", e)
+    
+    def _forward(self, model, batch):
+        """Run a forward pass, falling back to the eager model if compilation fails."""
+        if model is not self._compiled_model:
+            return model(batch)
+        # torch.compile is lazy, so toolchain errors only surface on a call
+        try:
+            return model(batch)
+        except Exception as e:
+            logger.warning("Compiled vision model failed, falling back to eager mode: %s", e)
+            with self._load_lock:
+                if self._model is model:
+                    self._model = self.fp32_model
+                self._compiled_model = None
+            return self.fp32_model(batch)
+    
     def _load_mock_class_labels(self) -> None:
         """Load mock class labels for testing."""
         self.class_labels = [
@@ -87,131 +259,266 @@ class VisionModel(AIModel):
     
     def _load_image(self, image_data: Union[str, bytes, np.ndarray]) -> Optional[Image.Image]:
         """Load an image from various formats."""
+        loader = _find_handler(self._loaders, image_data)
+        if loader is None:
+            logger.error("Unsupported image data type: %s", type(image_data))
+            return None
         try:
-            if isinstance(image_data, str):
-                # Handle base64 encoded image
-                if image_data.startswith("data:image"):
-                    # Extract the base64 part
-                    base64_data = image_data.split(",")[1]
-                    image_bytes = base64.b64decode(base64_data)
-                    return Image.open(io.BytesIO(image_bytes))
-                # Handle file path
-                else:
-                    return Image.open(image_data)
-            elif isinstance(image_data, bytes):
-                return Image.open(io.BytesIO(image_data))
-            elif isinstance(image_data, np.ndarray):
-                return Image.fromarray(image_data.astype("uint8"))
-            else:
-                logger.error(f"Unsupported image data type: {type(image_data)}")
-                return None
+            return loader(image_data)
         except Exception as e:
-            logger.exception(f"Error loading image: {str(e)}")
+            logger.exception("Error loading image: %s", e)
             return None
     
-    def _preprocess_image(self, image: Image.Image) -> torch.Tensor:
-        """Preprocess an image for the model."""
-        # Resize to 224x224 which is standard for many vision models
-        img = image.convert("RGB")
-        img = img.resize((224, 224))
-        
-        # Convert to tensor and normalize
-        img_tensor = F.to_tensor(img)
-        # Normalize with ImageNet mean and std
-        img_tensor = F.normalize(
-            img_tensor,
-            mean=[0.485, 0.456, 0.406],
-            std=[0.229, 0.224, 0.225]
-        )
+    def _load_str(self, image_data: str) -> Image.Image:
+        # Base64 data URIs are decoded in memory; anything else is a file path
+        if image_data[:10] == "data:image":
+            return self._load_bytes(_decode_data_uri(image_data))
+        return Image.open(image_data)
+    
+    def _load_bytes(self, image_data: bytes) -> Image.Image:
+        if image_data[:2] == JPEG_MAGIC:
+            array = self._decode_jpeg_cpu(image_data)
+            if array is not None:
+                return Image.fromarray(array)
+        return Image.open(io.BytesIO(image_data))
+    
+    def _load_ndarray(self, image_data: np.ndarray) -> Image.Image:
+        return Image.fromarray(np.asarray(image_data).astype("uint8"))
+    
+    def _decode_image(self, image_data: Union[str, bytes, np.ndarray]) -> Optional["torch.Tensor"]:
+        """Decode an image straight to a uint8 CHW tensor on the model device."""
+        decoder = _find_handler(self._decoders, image_data)
+        if decoder is None:
+            logger.error("Unsupported image data type: %s", type(image_data))
+            return None
+        try:
+            return decoder(image_data)
+        except Exception as e:
+            logger.exception("Error loading image: %s", e)
+            return None
+    
+    def _decode_str(self, image_data: str) -> "torch.Tensor":
+        if image_data[:10] == "data:image":
+            return self._decode_bytes(_decode_data_uri(image_data))
+        with open(image_data, "rb") as f:
+            return self._decode_bytes(f.read())
+    
+    def _decode_bytes(self, image_bytes: bytes) -> "torch.Tensor":
+        if image_bytes[:2] == JPEG_MAGIC:
+            # nvjpeg decodes JPEGs directly into device memory
+            if str(self.device).startswith("cuda"):
+                encoded = torch.frombuffer(bytearray(image_bytes), dtype=torch.uint8)
+                return decode_jpeg(encoded, mode=ImageReadMode.RGB, device=self.device)
+            array = self._decode_jpeg_cpu(image_bytes)
+            if array is not None:
+                return self._array_to_tensor(array)
+        
+        encoded = torch.frombuffer(bytearray(image_bytes), dtype=torch.uint8)
+        try:
+            return self._to_device(decode_image(encoded, mode=ImageReadMode.RGB))
+        except (RuntimeError, ValueError):
+            # decode_image only covers JPEG, PNG, GIF and WebP; PIL handles BMP, TIFF and the rest
+            with Image.open(io.BytesIO(image_bytes)) as image:
+                return self._array_to_tensor(np.array(image.convert("RGB")))
+    
+    def _decode_ndarray(self, image_data: np.ndarray) -> "torch.Tensor":
+        # asarray drops subclasses such as np.matrix that reshape on indexing
+        return self._array_to_tensor(np.asarray(image_data).astype("uint8"))
+    
+    def _decode_jpeg_cpu(self, image_bytes: bytes) -> Optional[np.ndarray]:
+        """Decode a JPEG to an RGB HWC array with libjpeg-turbo, if it is installed."""
+        if not TURBOJPEG_AVAILABLE or self._turbojpeg_failed:
+            return None
+        if self._turbojpeg is None:
+            try:
+                self._turbojpeg = TurboJPEG()
+            except Exception as e:
+                logger.warning("libjpeg-turbo unavailable, using default JPEG decoder: %s", e)
+                self._turbojpeg_failed = True
+                return None
+        return self._turbojpeg.decode(image_bytes, pixel_format=TJPF_RGB)
+    
+    def _array_to_tensor(self, array: np.ndarray) -> "torch.Tensor":
+        """Convert an HWC uint8 array to a CHW RGB tensor on the model device."""
+        if array.ndim == 2:
+            array = np.stack([array] * 3, axis=-1)
+        return self._to_device(torch.from_numpy(np.ascontiguousarray(array[..., :3]))).permute(2, 0, 1)
+    
+    def _to_device(self, tensor: "torch.Tensor") -> "torch.Tensor":
+        """
+        Move a CPU tensor to the model device.
         
-        # Add batch dimension
-        return img_tensor.unsqueeze(0).to(self.device)
+        On CUDA the tensor is staged in pinned memory and copied asynchronously
+        on the copy stream, so the copy overlaps with decoding the next image.
+        """
+        if self._copy_stream is None:
+            return tensor.to(self.device)
+        pinned = tensor.pin_memory()
+        with torch.cuda.stream(self._copy_stream):
+            return pinned.to(self.device, non_blocking=True)
+    
+    @contextlib.contextmanager
+    def _on_compute_stream(self, images: List["torch.Tensor"]):
+        """Run the enclosed work on the compute stream once the images are on the device."""
+        if self._compute_stream is None:
+            yield
+            return
+        self._compute_stream.wait_stream(self._copy_stream)
+        self._compute_stream.wait_stream(torch.cuda.current_stream(self.device))
+        for image in images:
+            # Keep the allocator from reusing the images' memory before the compute stream is done
+            image.record_stream(self._compute_stream)
+        with torch.cuda.stream(self._compute_stream):
+            yield
+    
+    def _preprocess_image(self, image: "torch.Tensor") -> "torch.Tensor":
+        """Resize and normalize a decoded image tensor, adding a batch dimension."""
+        return self._transform(image).unsqueeze(0)
     
     def run(self, context: ModelContext) -> ModelContext:
         """Run the vision model on the given context."""
-        if context.context_type != ContextType.IMAGE:
-            raise ValueError(f"Unsupported context type: {context.context_type.value}")
-        
-        # Load and preprocess the image
-        image_data = context.data
-        image = self._load_image(image_data)
-        if image is None:
-            raise ValueError("Failed to load image")
+        return self.run_batch([context])[0]
+    
+    def run_batch(self, contexts: List[ModelContext]) -> List[ModelContext]:
+        """Run the vision model on several image contexts with a single forward pass."""
+        for context in contexts:
+            if context.context_type != ContextType.IMAGE:
+                raise ValueError(f"Unsupported context type: {context.context_type.value}")
         
-        logger.info(f"Running vision model on image of size {image.size}")
+        # One clock read stamps every output and the model's last run time
+        now = time.time()
+        self.update_last_run_time(now)
         
         if not TORCHVISION_AVAILABLE or self.model is None:
-            # Mock implementation for testing
-            logger.warning("Using mock vision model inference.")
-            # Generate random predictions
-            predictions = np.random.random(size=len(self.class_labels))
-            predictions = predictions / np.sum(predictions)  # Normalize to probabilities
-            sorted_indices = np.argsort(predictions)[::-1][:5]  # Top 5 indices
-            
-            top_predictions = [
-                {
-                    "label": self.class_labels[i],
-                    "confidence": float(predictions[i])
-                }
-                for i in sorted_indices
-            ]
-            
-            result = {
-                "predictions": top_predictions,
-                "model_name": self.model_name,
-                "processing_time": 0.5  # Mock processing time
-            }
-            
-            time.sleep(1)  # Simulate processing time
-        else:
-            # Preprocess the image
-            img_tensor = self._preprocess_image(image)
-            
-            # Run inference
-            start_time = time.time()
-            with torch.no_grad():
-                output = self.model(img_tensor)
-            processing_time = time.time() - start_time
-            
-            # Get predictions
-            probabilities = torch.nn.functional.softmax(output[0], dim=0)
-            top5_prob, top5_catid = torch.topk(probabilities, 5)
+            return [self._run_mock(context, now) for context in contexts]
+        
+        # Decode every image; on CUDA the device copies are queued asynchronously
+        images = []
+        for context in contexts:
+            image = self._decode_image(context.data)
+            if image is None:
+                raise ValueError("Failed to load image")
+            images.append(image)
+        
+        logger.info("Running vision model on batch of %s images", len(contexts))
+        
+        # Numerically sensitive contexts bypass quantization and autocast
+        precise = any(FP32_TAG in context.metadata.tags for context in contexts)
+        model = self.fp32_model if precise else self.model
+        
+        # Run inference
+        start_ns = time.perf_counter_ns()
+        with self._on_compute_stream(images), torch.inference_mode():
+            batch = torch.cat([self._preprocess_image(image) for image in images])
+            with torch.autocast(
+                device_type=torch.device(self.device).type,
+                dtype=self._autocast_dtype,
+                enabled=self._autocast_dtype is not None and not precise
+            ):
+                output = self._forward(model, batch)
+            output = output.float()
             
+            # Softmax is monotonic, so take the top 5 logits and only
+            # normalize those against the log-partition of the full row
+            top5_logits, top5_catid = torch.topk(output, 5, dim=1)
+            top5_prob = torch.exp(top5_logits - torch.logsumexp(output, dim=1, keepdim=True))
+            # Copy the results to the host once per batch rather than per prediction
+            top5_prob = top5_prob.tolist()
+            top5_catid = top5_catid.tolist()
+        processing_time = (time.perf_counter_ns() - start_ns) / 1e9
+        
+        results = []
+        for context, probs, catids in zip(contexts, top5_prob, top5_catid):
             top_predictions = [
                 {
-                    "label": self.class_labels[idx.item()],
-                    "confidence": float(prob.item())
+                    "label": self.class_labels[idx],
+                    "confidence": prob
                 }
-                for prob, idx in zip(top5_prob, top5_catid)
+                for prob, idx in zip(probs, catids)
             ]
             
-            result = {
+            results.append(self._create_output_context(context, {
                 "predictions": top_predictions,
                 "model_name": self.model_name,
                 "processing_time": processing_time
+            }, now))
+        
+        return results
+    
+    def _run_mock(self, context: ModelContext, now: float) -> ModelContext:
+        """Run the mock implementation used when TorchVision is unavailable."""
+        image = self._load_image(context.data)
+        if image is None:
+            raise ValueError("Failed to load image")
+        
+        logger.info("Running vision model on image of size %s", image.size)
+        
+        # Mock implementation for testing
+        logger.warning("Using mock vision model inference.")
+        # Generate random predictions
+        predictions = np.random.random(size=len(self.class_labels))
+        # Select the top 5 in linear time, then order and normalize only those
+        k = min(5, predictions.size)
+        top_indices = np.argpartition(predictions, -k)[-k:] if k else np.empty(0, dtype=np.intp)
+        top_indices = top_indices[np.argsort(-predictions[top_indices])]
+        top_confidences = predictions[top_indices] / np.sum(predictions)
+        
+        top_predictions = [
+            {
+                "label": self.class_labels[i],
+                "confidence": float(confidence)
             }
+            for i, confidence in zip(top_indices, top_confidences)
+        ]
+        
+        result = {
+            "predictions": top_predictions,
+            "model_name": self.model_name,
+            "processing_time": 0.5  # Mock processing time
+        }
         
-        # Create output context
-        output_metadata = ContextMetadata(
-            creation_time=time.time(),
+        time.sleep(1)  # Simulate processing time
+        return self._create_output_context(context, result, now)
+    
+    def _create_output_context(self, context: ModelContext, result: Dict[str, Any],
+                               creation_time: float) -> ModelContext:
+        """Wrap classification results in an output context."""
+        output_metadata = self._new_context_object(
+            ContextMetadata,
+            creation_time=creation_time,
             source=f"vision_model:{self.model_name}",
             version="1.0",
             content_type="application/json",
-            tags=["inference", "vision-model", "classification"]
+            tags=OUTPUT_TAGS
         )
         
-        output_context = ModelContext(
+        return self._new_context_object(
+            ModelContext,
             context_id=f"{context.context_id}_result",
             context_type=ContextType.CATEGORICAL,
             data=result,
             metadata=output_metadata,
             model_type=ModelType.VISION
         )
-        
-        return output_context
 
 
-def create_default_vision_model(model_id: str = "default_vision_model") -> VisionModel:
+def _find_handler(handlers: Dict[type, Any], value: Any) -> Any:
+    """Look up the handler for a value's exact type, falling back to an isinstance scan for subclasses."""
+    handler = handlers.get(type(value))
+    if handler is None:
+        for cls, candidate in handlers.items():
+            if isinstance(value, cls):
+                return candidate
+    return handler
+
+
+def _decode_data_uri(data_uri: str) -> bytes:
+    """Extract and decode the base64 payload of a data URI."""
+    return base64.b64decode(data_uri.split(",", 1)[1])
+
+
+def create_default_vision_model(model_id: str = "default_vision_model",
+                                lazy_load: bool = True) -> VisionModel:
     """Create a default vision model instance."""
     model_info = ModelInfo(
         model_id=model_id,
@@ -228,7 +535,7 @@ def create_default_vision_model(model_id: str = "default_vision_model") -> Visio
         }
     )
     
-    return VisionModel(model_info, model_name="resnet50") 
+    return VisionModel(model_info, model_name="resnet50", lazy_load=lazy_load) 
 
 
 def initialize_model(data):
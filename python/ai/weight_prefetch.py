@@ -0,0 +1,94 @@
+"""
+Weight file prefetching for model loading.
+
+This module hints the kernel to read every weight shard of a model at once,
+so the disk reads overlap instead of happening one shard at a time inside
+from_pretrained or torch.load.
+"""
+import glob
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Sequence
+
+logger = logging.getLogger(__name__)
+
+WEIGHT_FILE_PATTERNS = ("*.safetensors", "*.bin", "*.pth", "*.pt")
+READ_CHUNK_SIZE = 8 * 1024 * 1024
+MAX_PREFETCH_WORKERS = 8
+
+
+def prefetch_files(paths: Sequence[str]) -> int:
+    """
+    Start reading the given files into the page cache.
+
+    On Linux this submits a POSIX_FADV_WILLNEED hint per file, which queues
+    asynchronous readahead for all of them without blocking. Elsewhere the
+    files are read concurrently on a thread pool. Returns the number of bytes
+    requested.
+    """
+    paths = [path for path in paths if os.path.isfile(path)]
+    if not paths:
+        return 0
+
+    total = sum(os.path.getsize(path) for path in paths)
+    logger.info("Prefetching %s weight files (%.1f MB)", len(paths), total / 1e6)
+    if hasattr(os, "posix_fadvise"):
+        for path in paths:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+    else:
+        with ThreadPoolExecutor(max_workers=min(MAX_PREFETCH_WORKERS, len(paths))) as executor:
+            list(executor.map(_read_file, paths))
+    return total
+
+
+def _read_file(path: str) -> None:
+    """Read a file in large chunks, discarding the data."""
+    with open(path, "rb", buffering=0) as f:
+        while f.read(READ_CHUNK_SIZE):
+            pass
+
+
+def find_pretrained_weight_files(model_name: str) -> List[str]:
+    """
+    Find the local weight files for a Hugging Face model.
+
+    ``model_name`` may be a local directory or a hub model ID that is already
+    in the local cache. Nothing is downloaded; an empty list is returned when
+    the files are not available locally.
+    """
+    directory = model_name
+    if not os.path.isdir(directory):
+        try:
+            from huggingface_hub import snapshot_download
+            directory = snapshot_download(
+                model_name,
+                allow_patterns=list(WEIGHT_FILE_PATTERNS),
+                local_files_only=True
+            )
+        except Exception:
+            return []
+
+    # Prefer safetensors; from_pretrained ignores .bin files when they exist
+    for patterns in (WEIGHT_FILE_PATTERNS[:1], WEIGHT_FILE_PATTERNS[1:]):
+        files = sorted(
+            path
+            for pattern in patterns
+            for path in glob.glob(os.path.join(directory, pattern))
+        )
+        if files:
+            return files
+    return []
+
+
+def prefetch_pretrained(model_name: str) -> int:
+    """Prefetch the locally cached weight files of a Hugging Face model."""
+    try:
+        return prefetch_files(find_pretrained_weight_files(model_name))
+    except OSError as e:
+        logger.warning("Error prefetching weights for %s: %s", model_name, e)
+        return 0
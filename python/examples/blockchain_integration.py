@@ -5,17 +5,23 @@ This script demonstrates how to register AI models on the Solana blockchain,
 mint MCP tokens, and manage model ownership and access.
 """
 import argparse
+import asyncio
+import atexit
+import itertools
 import json
 import logging
+import logging.handlers
 import os
+import queue
+import secrets
 import sys
 import time
-import uuid
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 sys.path.append(str(Path(__file__).parent.parent))
 
+import numpy as np
 from dotenv import load_dotenv
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
@@ -27,51 +33,85 @@ from mcp.model_context import (
     ModelContext, 
     ModelType
 )
-from ai.model_manager import ModelManager, ModelStatus
+from ai.model_manager import ModelManager
 from ai.language_model import create_default_language_model
 from ai.vision_model import create_default_vision_model
 from utils.blockchain import (
     SolanaConfig, 
     SolanaConnection, 
     MCPTokenClient, 
-    ModelRegistryClient
+    ModelRegistryClient,
+    is_transaction_signature
 )
+from utils.hedged_rpc import HedgedConnection, connect_endpoints, rpc_urls_from_env
+from utils.state_cache import StateCache, slots_to_seconds
 
-# Set up logging
+# Set up logging. Records are queued and written by a listener thread, so
+# callers never block on console or file I/O.
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_log_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+_log_handlers = [
+    logging.StreamHandler(sys.stdout),
+    logging.FileHandler("blockchain_integration.log", delay=True)
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler("blockchain_integration.log")
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
+# Context ID suffixes are a random per-process prefix plus a counter, so
+# only one urandom read is made per process rather than one per request
+_ID_PREFIX = secrets.token_hex(4)
+_ID_COUNTER = itertools.count()
 
 
-def setup_blockchain_connection() -> SolanaConnection:
-    """Set up connection to Solana blockchain."""
+# PCG64 generator for mock image inputs; much faster than the legacy np.random API
+_RNG = np.random.default_rng()
+MOCK_IMAGE_SHAPE = (224, 224, 3)
+
+# Registry entries are cached on disk for this many slots (about a minute)
+MODEL_DATA_CACHE_SLOTS = 150
+
+
+def setup_blockchain_connection() -> Union[SolanaConnection, HedgedConnection]:
+    """Set up connection to Solana blockchain, hedging reads when several endpoints are configured."""
     # Modified: 2025-04-26T22:17:39.859584
     # Modified: 2025-04-26T22:17:03.233212
-    rpc_url = os.getenv("SOLANA_RPC_URL", "https://api.devnet.solana.com")
+    rpc_urls = rpc_urls_from_env(os.environ)
     keypair_path = os.getenv("SOLANA_KEYPAIR_PATH")
     
-    config = SolanaConfig(
-        rpc_url=rpc_url,
-        keypair_path=keypair_path
-    )
-    
-    connection = SolanaConnection(config)
+    connection = connect_endpoints(rpc_urls, keypair_path)
+    config = connection.config
+    rpc_url = ", ".join(rpc_urls)
     
     # Check connection and balance
     if connection.keypair:
-        balance = connection.get_balance()
-        logger.info(f"Connected to Solana {rpc_url}")
-        logger.info(f"Public key: {connection.keypair.public_key}")
-        logger.info(f"Balance: {balance / 1_000_000_000} SOL")
+        # Fetch all startup state in a single batched request
+        commitment = {"commitment": config.commitment}
+        balance_resp, blockhash_resp, rent_resp = connection.batch_rpc([
+            {"method": "getBalance", "params": [str(connection.keypair.public_key), commitment]},
+            {"method": "getLatestBlockhash", "params": [commitment]},
+            {"method": "getMinimumBalanceForRentExemption", "params": [0, commitment]},
+        ])
+        if "result" not in balance_resp:
+            logger.error("Error getting balance: %s", balance_resp.get("error"))
+        balance = balance_resp.get("result", {}).get("value", 0)
+        
+        logger.info("Connected to Solana %s", rpc_url)
+        logger.info("Public key: %s", connection.keypair.public_key)
+        logger.info("Balance: %s SOL", balance / 1_000_000_000)
+        if "result" in blockhash_resp:
+            logger.info("Latest blockhash: %s", blockhash_resp["result"]["value"]["blockhash"])
+        if "result" in rent_resp:
+            logger.info("Rent-exempt minimum: %s lamports", rent_resp["result"])
         
         # Request airdrop if balance is low
         if balance < 1_000_000_000:  # Less than 1 SOL
@@ -86,46 +126,78 @@ def setup_blockchain_connection() -> SolanaConnection:
 def setup_clients(connection: SolanaConnection) -> tuple:
     """Set up blockchain clients."""
     program_ids = {
-        "mcp_token": os.getenv("MCP_TOKEN_PROGRAM_ID", "Fg6PaFpoGXkYsidMpWTK6W2BeZ7FEfcYkg476zPFsLnS"),
-        "model_registry": os.getenv("MODEL_REGISTRY_PROGRAM_ID", "BPFLoader2111111111111111111111111111111111"),
-        "token_mint": os.getenv("MCP_TOKEN_MINT", "4uQeVj5tqViQh7yWWGStvkEG1Zmhx6uasJtWCJziofM"),
+        "mcp_token": PublicKey(os.getenv("MCP_TOKEN_PROGRAM_ID", "Fg6PaFpoGXkYsidMpWTK6W2BeZ7FEfcYkg476zPFsLnS")),
+        "model_registry": PublicKey(os.getenv("MODEL_REGISTRY_PROGRAM_ID", "BPFLoader2111111111111111111111111111111111")),
+        "token_mint": PublicKey(os.getenv("MCP_TOKEN_MINT", "4uQeVj5tqViQh7yWWGStvkEG1Zmhx6uasJtWCJziofM")),
     }
     
+    # Check that every account exists with a single getMultipleAccounts call.
+    # This is advisory only; an unreachable RPC must not stop local actions.
+    try:
+        accounts = connection.get_multiple_accounts(list(program_ids.values()))
+    except Exception as e:
+        logger.warning("Could not check program accounts: %s", e)
+    else:
+        for name, account in zip(program_ids, accounts):
+            if account is None:
+                logger.warning("Account for %s (%s) not found on chain", name, program_ids[name])
+    
     mcp_token_client = MCPTokenClient(
         connection,
-        PublicKey(program_ids["mcp_token"]),
-        PublicKey(program_ids["token_mint"])
+        program_ids["mcp_token"],
+        program_ids["token_mint"]
     )
     
     model_registry_client = ModelRegistryClient(
         connection,
-        PublicKey(program_ids["model_registry"])
+        program_ids["model_registry"]
     )
     
     return mcp_token_client, model_registry_client
 
 
-def register_models_on_chain(model_manager: ModelManager, 
-                           model_registry: ModelRegistryClient) -> Dict[str, str]:
-    """Register models on the blockchain."""
+async def register_models_on_chain(model_manager: ModelManager, 
+                                 model_registry: ModelRegistryClient,
+                                 timeout: float = 30.0) -> Dict[str, str]:
+    """Register models on the blockchain, submitting all registrations concurrently."""
     # Get all models
     models = model_manager.list_models()
     
-    # Register each model
-    tx_signatures = {}
+    # Submit every registration at once
     for model_info in models:
-        logger.info(f"Registering model {model_info.model_id} on the blockchain")
-        
-        # Convert model info to JSON-compatible dict
-        model_data = model_info.to_dict()
-        
-        # Register on the blockchain
-        tx_sig = model_registry.register_model(model_info.model_id, model_data)
-        if tx_sig:
-            logger.info(f"Model registered with signature: {tx_sig}")
+        logger.info("Registering model %s on the blockchain", model_info.model_id)
+    results = await asyncio.gather(
+        *(model_registry.register_model_async(m.model_id, m.to_dict()) for m in models),
+        return_exceptions=True
+    )
+    
+    tx_signatures = {}
+    for model_info, tx_sig in zip(models, results):
+        if isinstance(tx_sig, Exception):
+            logger.error("Failed to register model %s: %s", model_info.model_id, tx_sig)
+        elif tx_sig:
+            logger.info("Model registered with signature: %s", tx_sig)
             tx_signatures[model_info.model_id] = tx_sig
         else:
-            logger.error(f"Failed to register model {model_info.model_id}")
+            logger.error("Failed to register model %s", model_info.model_id)
+    
+    # Confirm all registrations together with batched status polling. Only
+    # real signatures are polled; anything else was never sent to the chain.
+    sent = {model_id: tx_sig for model_id, tx_sig in tx_signatures.items() if is_transaction_signature(tx_sig)}
+    if sent:
+        try:
+            confirmed = await asyncio.get_running_loop().run_in_executor(
+                None,
+                model_registry.connection.confirm_transactions,
+                list(set(sent.values())),
+                timeout
+            )
+        except Exception as e:
+            logger.error("Error confirming model registrations: %s", e)
+        else:
+            for model_id, tx_sig in sent.items():
+                if not confirmed.get(tx_sig):
+                    logger.warning("Registration of model %s not confirmed: %s", model_id, tx_sig)
     
     return tx_signatures
 
@@ -134,48 +206,60 @@ def mint_tokens_for_model_access(mcp_token_client: MCPTokenClient,
                                 user_key: PublicKey, 
                                 amount: int = 100) -> Optional[str]:
     """Mint MCP tokens for model access."""
-    logger.info(f"Minting {amount} MCP tokens to {user_key}")
+    logger.info("Minting %s MCP tokens to %s", amount, user_key)
     
     # Mint tokens
     tx_sig = mcp_token_client.mint_tokens(user_key, amount)
     if tx_sig:
-        logger.info(f"Tokens minted with signature: {tx_sig}")
+        logger.info("Tokens minted with signature: %s", tx_sig)
     else:
         logger.error("Failed to mint tokens")
     
     return tx_sig
 
 
+def get_model_data_cached(model_registry: ModelRegistryClient,
+                          model_id: str,
+                          cache: Optional[StateCache] = None) -> Optional[Dict[str, Any]]:
+    """Get a model's registry data, from the on-disk cache when it is fresh."""
+    if cache is None:
+        return model_registry.get_model_data(model_id)
+    
+    key = f"{model_registry.program_id}:{model_id}"
+    cached = cache.get(key)
+    if cached is not None:
+        return json.loads(cached)
+    
+    model_data = model_registry.get_model_data(model_id)
+    if model_data:
+        cache.set(key, json.dumps(model_data).encode("utf-8"), slots_to_seconds(MODEL_DATA_CACHE_SLOTS))
+    return model_data
+
+
 def run_model_with_blockchain_verification(model_manager: ModelManager,
                                          model_registry: ModelRegistryClient,
                                          model_id: str,
-                                         context: ModelContext) -> Optional[ModelContext]:
+                                         context: ModelContext,
+                                         cache: Optional[StateCache] = None) -> Optional[ModelContext]:
     """Run a model with blockchain verification."""
     # Verify the model exists on the blockchain
-    model_data = model_registry.get_model_data(model_id)
+    model_data = get_model_data_cached(model_registry, model_id, cache)
     if not model_data:
-        logger.error(f"Model {model_id} not found on the blockchain")
+        logger.error("Model %s not found on the blockchain", model_id)
         return None
     
     # Get the model
     model = model_manager.get_model(model_id)
     if not model:
-        logger.error(f"Model {model_id} not found locally")
+        logger.error("Model %s not found locally", model_id)
         return None
     
-    # Initialize if needed
-    if model.status == ModelStatus.INITIALIZING:
-        logger.info(f"Initializing model {model_id}")
-        if not model_manager.initialize_model(model_id):
-            logger.error(f"Failed to initialize model {model_id}")
-            return None
-    
     # Run the model
-    logger.info(f"Running model {model_id}")
+    logger.info("Running model %s", model_id)
     result = model_manager.run_model(model_id, context)
     
     # Log the result to the blockchain (could be implemented)
-    logger.info(f"Model run complete: {model_id}")
+    logger.info("Model run complete: %s", model_id)
     
     return result
 
@@ -205,6 +289,11 @@ def main():
         "--recipient",
         help="Recipient public key for token minting"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always read model registry data from the chain"
+    )
     args = parser.parse_args()
     
     # Set up blockchain connection
@@ -217,8 +306,8 @@ def main():
     model_manager = ModelManager()
     
     # Register available models
-    language_model = create_default_language_model()
-    vision_model = create_default_vision_model()
+    language_model = create_default_language_model(lazy_load=False)
+    vision_model = create_default_vision_model(lazy_load=False)
     
     model_manager.register_model(language_model)
     model_manager.register_model(vision_model)
@@ -226,8 +315,8 @@ def main():
     # Perform action
     if args.action == "register":
         logger.info("Registering models on the blockchain")
-        tx_signatures = register_models_on_chain(model_manager, model_registry_client)
-        logger.info(f"Registered {len(tx_signatures)} models")
+        tx_signatures = asyncio.run(register_models_on_chain(model_manager, model_registry_client))
+        logger.info("Registered %s models", len(tx_signatures))
     
     elif args.action == "mint":
         if args.recipient:
@@ -238,16 +327,21 @@ def main():
             logger.error("No recipient specified")
             return
         
-        logger.info(f"Minting {args.amount} tokens to {recipient}")
+        logger.info("Minting %s tokens to %s", args.amount, recipient)
         tx_sig = mint_tokens_for_model_access(mcp_token_client, recipient, args.amount)
         if tx_sig:
-            logger.info(f"Tokens minted: {tx_sig}")
+            logger.info("Tokens minted: %s", tx_sig)
     
     elif args.action == "run":
         if not args.model_id:
             logger.error("No model ID specified")
             return
         
+        # Only the model this run uses is loaded
+        if not model_manager.initialize_model(args.model_id):
+            logger.error("Failed to initialize model %s", args.model_id)
+            return
+        
         # Create a sample context
         if args.model_id == "default_language_model":
             # Text input for language model
@@ -259,7 +353,7 @@ def main():
             )
             
             context = ModelContext(
-                context_id=f"text_input_{uuid.uuid4().hex[:8]}",
+                context_id=f"text_input_{_ID_PREFIX}{next(_ID_COUNTER):08x}",
                 context_type=ContextType.TEXT,
                 data="What is the Model Context Protocol?",
                 metadata=metadata,
@@ -276,26 +370,27 @@ def main():
             )
             
             # Create a mock image (just random data for this example)
-            image_data = np.random.randint(0, 255, (224, 224, 3), dtype=np.uint8)
+            image_data = _RNG.integers(0, 256, size=MOCK_IMAGE_SHAPE, dtype=np.uint8)
             
             context = ModelContext(
-                context_id=f"image_input_{uuid.uuid4().hex[:8]}",
+                context_id=f"image_input_{_ID_PREFIX}{next(_ID_COUNTER):08x}",
                 context_type=ContextType.IMAGE,
                 data=image_data,
                 metadata=metadata,
                 model_type=ModelType.VISION
             )
         
-        logger.info(f"Running model {args.model_id} with blockchain verification")
+        logger.info("Running model %s with blockchain verification", args.model_id)
         result = run_model_with_blockchain_verification(
             model_manager, 
             model_registry_client, 
             args.model_id, 
-            context
+            context,
+            cache=None if args.no_cache else StateCache("model_registry")
         )
         
         if result:
-            logger.info(f"Model output: {result.data}")
+            logger.info("Model output: %s", result.data)
 
 
 if __name__ == "__main__":
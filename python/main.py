@@ -5,13 +5,18 @@ This module provides a CLI and integration points for the MCP, AI models,
 and Solana blockchain components.
 """
 import argparse
+import atexit
+import dataclasses
+import itertools
 import json
 import logging
+import logging.handlers
 import os
+import queue
+import secrets
 import sys
 import time
-import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from dotenv import load_dotenv
 from solana.publickey import PublicKey
@@ -23,7 +28,7 @@ from mcp.model_context import (
     ModelContext, 
     ModelType
 )
-from ai.model_manager import ModelManager, ModelStatus
+from ai.model_manager import ModelManager
 from ai.language_model import create_default_language_model
 from utils.blockchain import (
     SolanaConfig, 
@@ -31,49 +36,77 @@ from utils.blockchain import (
     MCPTokenClient, 
     ModelRegistryClient
 )
+from utils.hedged_rpc import HedgedConnection, connect_endpoints, rpc_urls_from_env
 
-# Set up logging
+# Set up logging. Records are queued and written by a listener thread, so
+# callers never block on console or file I/O.
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_log_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+_log_handlers = [
+    logging.StreamHandler(sys.stdout),
+    logging.FileHandler("solana_mcp_ai.log", delay=True)
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler("solana_mcp_ai.log")
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
+# Context ID suffixes are a random per-process prefix plus a counter, so
+# only one urandom read is made per process rather than one per request
+_ID_PREFIX = secrets.token_hex(4)
+_ID_COUNTER = itertools.count()
+
+# Metadata shared by every text input; only creation_time changes per request.
+# Tags are an immutable tuple because replace() shares them between copies.
+_TEXT_META_TEMPLATE = ContextMetadata(
+    creation_time=0.0,
+    source="user_input",
+    version="1.0",
+    content_type="text/plain",
+    tags=(),
+)
 
 
 # setup_solana_connection: This function processes data for the system
-def setup_solana_connection() -> SolanaConnection:
-    """Set up connection to Solana blockchain."""
+def setup_solana_connection() -> Union[SolanaConnection, HedgedConnection]:
+    """Set up connection to Solana blockchain, hedging reads when several endpoints are configured."""
     # Modified: 2025-04-26T22:17:04.784146
-    rpc_url = os.getenv("SOLANA_RPC_URL", "https://api.devnet.solana.com")
+    rpc_urls = rpc_urls_from_env(os.environ)
     keypair_path = os.getenv("SOLANA_KEYPAIR_PATH")
     
     if not keypair_path:
         logger.warning("No keypair path provided. Using ephemeral keypair.")
         keypair_path = None
     
-    config = SolanaConfig(
-        rpc_url=rpc_url,
-        keypair_path=keypair_path
-    )
-    
-    return SolanaConnection(config)
+    return connect_endpoints(rpc_urls, keypair_path)
 
 
-def setup_model_manager() -> ModelManager:
-    """Set up the AI model manager."""
+def setup_model_manager(initialize: bool = False) -> ModelManager:
+    """
+    Set up the AI model manager.
+    
+    With ``initialize`` every model is loaded up front, so inference never
+    pays for a cold start; actions that run no model leave it unset.
+    """
     manager = ModelManager()
     
     # Register default language model
-    language_model = create_default_language_model()
+    language_model = create_default_language_model(lazy_load=False)
     manager.register_model(language_model)
     
+    if initialize:
+        for model_id, success in manager.initialize_models().items():
+            if not success:
+                logger.error("Failed to initialize model %s", model_id)
+    
     return manager
 
 
@@ -84,16 +117,17 @@ def setup_context_registry() -> ContextRegistry:
 
 def run_text_generation(manager: ModelManager, 
                       registry: ContextRegistry, 
-                      input_text: str) -> Optional[str]:
-    """Run text generation using the language model."""
+                      input_text: str,
+                      register_io: bool = False) -> Optional[str]:
+    """
+    Run text generation using the language model.
+    
+    The input and output contexts are only added to ``registry`` when
+    ``register_io`` is set, for callers that look them up afterwards.
+    """
     # Create input context
-    context_id = f"text_input_{uuid.uuid4().hex[:8]}"
-    metadata = ContextMetadata(
-        creation_time=time.time(),
-        source="user_input",
-        version="1.0",
-        content_type="text/plain",
-    )
+    context_id = f"text_input_{_ID_PREFIX}{next(_ID_COUNTER):08x}"
+    metadata = dataclasses.replace(_TEXT_META_TEMPLATE, creation_time=time.time())
     
     input_context = ModelContext(
         context_id=context_id,
@@ -104,7 +138,8 @@ def run_text_generation(manager: ModelManager,
     )
     
     # Register the input context
-    registry.register(input_context)
+    if register_io:
+        registry.register(input_context)
     
     # Find a suitable language model
     models = manager.list_models(model_type=ModelType.LANGUAGE)
@@ -112,26 +147,19 @@ def run_text_generation(manager: ModelManager,
         logger.error("No language models available")
         return None
     
-    # Use the first available model
+    # Use the first available model; setup_model_manager has already initialized it
     model_id = models[0].model_id
     
-    # Initialize the model if needed
-    model = manager.get_model(model_id)
-    if model.status == ModelStatus.INITIALIZING:
-        logger.info(f"Initializing model {model_id}")
-        if not manager.initialize_model(model_id):
-            logger.error(f"Failed to initialize model {model_id}")
-            return None
-    
     # Run the model
-    logger.info(f"Running model {model_id}")
+    logger.info("Running model %s", model_id)
     output_context = manager.run_model(model_id, input_context)
     if not output_context:
-        logger.error(f"Failed to run model {model_id}")
+        logger.error("Failed to run model %s", model_id)
         return None
     
     # Register the output context
-    registry.register(output_context)
+    if register_io:
+        registry.register(output_context)
     
     return output_context.data
 
@@ -141,7 +169,7 @@ def register_model_on_chain(connection: SolanaConnection,
                           model_id: str,
                           model_info: Dict[str, Any]) -> Optional[str]:
     """Register a model on the blockchain."""
-    logger.info(f"Registering model {model_id} on the blockchain")
+    logger.info("Registering model %s on the blockchain", model_id)
     return model_registry.register_model(model_id, model_info)
 
 
@@ -169,10 +197,10 @@ def main():
     # Set up components
     try:
         solana_connection = setup_solana_connection()
-        model_manager = setup_model_manager()
+        model_manager = setup_model_manager(initialize=args.action == "generate")
         context_registry = setup_context_registry()
     except Exception as e:
-        logger.exception(f"Error setting up components: {str(e)}")
+        logger.exception("Error setting up components: %s", e)
         return
     
     # Create clients
@@ -187,7 +215,7 @@ def main():
             PublicKey(os.getenv("MODEL_REGISTRY_PROGRAM_ID", "BPFLoader2111111111111111111111111111111111"))
         )
     except Exception as e:
-        logger.exception(f"Error creating clients: {str(e)}")
+        logger.exception("Error creating clients: %s", e)
         return
     
     # Perform action
@@ -198,7 +226,7 @@ def main():
         
         output = run_text_generation(model_manager, context_registry, args.input)
         if output:
-            logger.info(f"Generated text: {output}")
+            logger.info("Generated text: %s", output)
     
     elif args.action == "register":
         if not args.model_id:
@@ -214,7 +242,7 @@ def main():
                 break
         
         if not model_info:
-            logger.error(f"Model {args.model_id} not found")
+            logger.error("Model %s not found", args.model_id)
             return
         
         tx_sig = register_model_on_chain(
@@ -225,15 +253,15 @@ def main():
         )
         
         if tx_sig:
-            logger.info(f"Model registered on chain: {tx_sig}")
+            logger.info("Model registered on chain: %s", tx_sig)
         else:
             logger.error("Failed to register model on chain")
     
     elif args.action == "list":
         models = model_manager.list_models()
-        logger.info(f"Available models: {len(models)}")
+        logger.info("Available models: %s", len(models))
         for model in models:
-            logger.info(f"  - {model.model_id}: {model.name} ({model.status.value})")
+            logger.info("  - %s: %s (%s)", model.model_id, model.name, model.status.value)
 
 
 if __name__ == "__main__":
@@ -19,11 +19,11 @@ class InitializeModelModule:
     def __init__(self, config: Optional[Dict] = None):
         """Initialize the InitializeModelModule."""
         self.config = config or {}
-        logger.info(f"InitializeModelModule initialized with config: {self.config}")
+        logger.info("InitializeModelModule initialized with config: %s", self.config)
     
     def process(self, data: Dict) -> Dict:
         """Process the input data."""
-        logger.info(f"Processing data: {data}")
+        logger.info("Processing data: %s", data)
         # Implementation goes here
         result = {"status": "success", "data": data}
         return result
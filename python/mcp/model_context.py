@@ -4,16 +4,37 @@ Model Context Protocol (MCP) implementation.
 This module implements the core Model Context Protocol functionalities,
 providing a standardized way to interact with various AI models.
 """
+import base64
 import json
 import logging
-from dataclasses import dataclass, field
+import sys
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import MISSING, dataclass, field, fields
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type, TypeVar, Union
 
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    # Accept the numpy scalars and non-string keys that json.dumps handles
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Default number of contexts a ContextRegistry keeps before evicting
+DEFAULT_REGISTRY_SIZE = 10_000
+
+# Key marking a serialized numpy array in a context's "data" field
+NDARRAY_KEY = "__ndarray__"
+
+# Slotted dataclasses need Python 3.10+; older interpreters fall back to __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class ModelType(Enum):
     """Types of models supported by the MCP."""
@@ -38,7 +59,25 @@ class ContextType(Enum):
     MIXED = "mixed"
 
 
-@dataclass
+# Compact integer codes written to serialized payloads. Codes follow
+# definition order, so new members must be added at the end of each enum.
+MODEL_TYPE_CODES: Dict[ModelType, int] = {member: code for code, member in enumerate(ModelType, start=1)}
+CONTEXT_TYPE_CODES: Dict[ContextType, int] = {member: code for code, member in enumerate(ContextType, start=1)}
+
+# Value-to-member tables; a dict lookup is much cheaper than Enum(value).
+# They accept both integer codes and the older string values, so payloads
+# written before the switch to codes still load.
+MODEL_TYPES_BY_VALUE: Dict[Union[int, str], ModelType] = {
+    **{member.value: member for member in ModelType},
+    **{code: member for member, code in MODEL_TYPE_CODES.items()},
+}
+CONTEXT_TYPES_BY_VALUE: Dict[Union[int, str], ContextType] = {
+    **{member.value: member for member in ContextType},
+    **{code: member for member, code in CONTEXT_TYPE_CODES.items()},
+}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ContextMetadata:
     """Metadata for model contexts."""
     
@@ -47,19 +86,32 @@ class ContextMetadata:
     version: str
     dimensions: Optional[List[int]] = None
     content_type: Optional[str] = None
-    tags: List[str] = field(default_factory=list)
+    tags: Sequence[str] = field(default_factory=list)
+    # Memoized to_dict() result, dropped whenever a field is assigned
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name != "_dict_cache":
+            object.__setattr__(self, "_dict_cache", None)
+    
+    def mark_dirty(self) -> None:
+        """Drop the memoized dict after mutating a field in place (e.g. appending a tag)."""
+        self._dict_cache = None
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary representation."""
+        """Convert to dictionary representation. The result is shared and must not be modified."""
     # Modified: 2025-04-26T22:17:17.857609
-        return {
-            "creation_time": self.creation_time,
-            "source": self.source,
-            "version": self.version,
-            "dimensions": self.dimensions,
-            "content_type": self.content_type,
-            "tags": self.tags,
-        }
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "creation_time": self.creation_time,
+                "source": self.source,
+                "version": self.version,
+                "dimensions": self.dimensions,
+                "content_type": self.content_type,
+                "tags": self.tags,
+            }
+        return self._dict_cache
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ContextMetadata":
@@ -74,7 +126,7 @@ class ContextMetadata:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ModelContext:
     """
     Model Context for the MCP.
@@ -87,38 +139,55 @@ class ModelContext:
     data: Any
     metadata: ContextMetadata
     model_type: Optional[ModelType] = None
+    # Memoized to_dict() and to_json() results, dropped whenever a field is assigned
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    _json_cache: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name not in ("_dict_cache", "_json_cache"):
+            self.mark_dirty()
+    
+    def mark_dirty(self) -> None:
+        """Drop the memoized serializations after mutating ``data`` in place."""
+        object.__setattr__(self, "_dict_cache", None)
+        object.__setattr__(self, "_json_cache", None)
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary representation."""
-        data_serialized = self.data
-        
-        # Handle numpy arrays
-        if isinstance(self.data, np.ndarray):
-            data_serialized = self.data.tolist()
+        """Convert to dictionary representation. The result is shared and must not be modified."""
+        metadata = self.metadata.to_dict()
+        # A changed metadata object hands back a new dict, so identity tells us it is stale
+        if self._dict_cache is not None and self._dict_cache["metadata"] is metadata:
+            return self._dict_cache
         
-        return {
+        self.mark_dirty()
+        self._dict_cache = {
             "context_id": self.context_id,
-            "context_type": self.context_type.value,
-            "data": data_serialized,
-            "metadata": self.metadata.to_dict(),
-            "model_type": self.model_type.value if self.model_type else None,
+            "context_type": CONTEXT_TYPE_CODES[self.context_type],
+            "data": _SERIALIZERS.get(self.context_type, _serialize_array_data)(self.data),
+            "metadata": metadata,
+            "model_type": MODEL_TYPE_CODES[self.model_type] if self.model_type else None,
         }
+        return self._dict_cache
     
     def to_json(self) -> str:
         """Convert to JSON string."""
-        return json.dumps(self.to_dict())
+        data = self.to_dict()
+        if self._json_cache is None:
+            self._json_cache = _dumps(data)
+        return self._json_cache
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ModelContext":
         """Create from dictionary representation."""
-        context_type = ContextType(data["context_type"])
-        model_type = ModelType(data["model_type"]) if data.get("model_type") else None
+        context_type = CONTEXT_TYPES_BY_VALUE[data["context_type"]]
+        model_type = MODEL_TYPES_BY_VALUE[data["model_type"]] if data.get("model_type") else None
         metadata = ContextMetadata.from_dict(data["metadata"])
         
         return cls(
             context_id=data["context_id"],
             context_type=context_type,
-            data=data["data"],
+            data=_DESERIALIZERS.get(context_type, _deserialize_array_data)(data["data"]),
             metadata=metadata,
             model_type=model_type,
         )
@@ -126,49 +195,196 @@ class ModelContext:
     @classmethod
     def from_json(cls, json_str: str) -> "ModelContext":
         """Create from JSON string."""
-        data = json.loads(json_str)
+        data = orjson.loads(json_str) if ORJSON_AVAILABLE else json.loads(json_str)
         return cls.from_dict(data)
 
 
+def _dumps(data: Any) -> str:
+    """Serialize to JSON with orjson when available, falling back to json for what it rejects."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, option=_ORJSON_OPTIONS).decode()
+        except TypeError:
+            # e.g. integers wider than 64 bits
+            pass
+    return json.dumps(data)
+
+
+def _encode_ndarray(array: np.ndarray) -> Dict[str, Any]:
+    """Serialize a numpy array as its raw bytes in base64, with dtype and shape."""
+    return {
+        NDARRAY_KEY: base64.b64encode(np.ascontiguousarray(array).tobytes()).decode("ascii"),
+        "dtype": array.dtype.str,
+        "shape": list(array.shape),
+    }
+
+
+def _decode_ndarray(data: Dict[str, Any]) -> np.ndarray:
+    """Rebuild a numpy array serialized by _encode_ndarray."""
+    # One copy into a bytearray keeps the array writable, as callers expect
+    buffer = bytearray(base64.b64decode(data[NDARRAY_KEY]))
+    return np.frombuffer(buffer, dtype=np.dtype(data["dtype"])).reshape(data["shape"])
+
+
+def _identity(data: Any) -> Any:
+    return data
+
+
+def _serialize_array_data(data: Any) -> Any:
+    """Encode numpy arrays as base64 bytes; other values are already JSON-compatible."""
+    return _encode_ndarray(data) if isinstance(data, np.ndarray) else data
+
+
+def _deserialize_array_data(data: Any) -> Any:
+    if isinstance(data, dict) and NDARRAY_KEY in data:
+        return _decode_ndarray(data)
+    return data
+
+
+# Per-context-type data (de)serializers; types not listed may hold numpy arrays
+_SERIALIZERS: Dict[ContextType, Callable[[Any], Any]] = {
+    ContextType.TEXT: _identity,
+    ContextType.CATEGORICAL: _identity,
+}
+_DESERIALIZERS: Dict[ContextType, Callable[[Any], Any]] = {
+    ContextType.TEXT: _identity,
+    ContextType.CATEGORICAL: _identity,
+}
+
+
+T = TypeVar("T", ContextMetadata, ModelContext)
+
+
+class ContextPool:
+    """
+    Per-thread free lists of ModelContext and ContextMetadata instances.
+    
+    Objects handed out by ``acquire`` belong to the caller until passed back
+    to ``release``; they must not be referenced afterwards, since a released
+    object is reset and reused by a later ``acquire`` on the same thread.
+    """
+    
+    def __init__(self, max_size: int = 64):
+        self.max_size = max_size
+        self._local = threading.local()
+    
+    def _free_list(self, cls: Type[T]) -> List[T]:
+        free_lists = self._local.__dict__.setdefault("free_lists", {})
+        return free_lists.setdefault(cls, [])
+    
+    def acquire(self, cls: Type[T], **values: Any) -> T:
+        """Get an instance of ``cls`` with the given field values, reusing a pooled one if possible."""
+        free = self._free_list(cls)
+        if not free:
+            return cls(**values)
+        
+        obj = free.pop()
+        for name, default in _field_defaults(cls):
+            if name in values:
+                setattr(obj, name, values[name])
+            elif default is MISSING:
+                raise TypeError(f"{cls.__name__} requires field '{name}'")
+            else:
+                setattr(obj, name, default())
+        return obj
+    
+    def release(self, obj: Union[ContextMetadata, ModelContext]) -> None:
+        """Return an instance, and the metadata of a ModelContext, to the pool."""
+        if isinstance(obj, ModelContext) and obj.metadata is not None:
+            self.release(obj.metadata)
+            obj.metadata = None
+        
+        free = self._free_list(type(obj))
+        if len(free) < self.max_size:
+            if isinstance(obj, ModelContext):
+                obj.data = None
+            free.append(obj)
+
+
+_FIELD_DEFAULTS: Dict[type, List] = {}
+
+
+def _field_defaults(cls: type) -> List:
+    """List (name, default factory or MISSING) for each dataclass field of ``cls``."""
+    defaults = _FIELD_DEFAULTS.get(cls)
+    if defaults is None:
+        defaults = []
+        for f in fields(cls):
+            if f.default is not MISSING:
+                defaults.append((f.name, lambda value=f.default: value))
+            elif f.default_factory is not MISSING:
+                defaults.append((f.name, f.default_factory))
+            else:
+                defaults.append((f.name, MISSING))
+        _FIELD_DEFAULTS[cls] = defaults
+    return defaults
+
+
 class ContextRegistry:
     """
     Registry for model contexts.
     
-    Provides a centralized store for managing model contexts.
+    Provides a centralized store for managing model contexts. At most
+    ``max_size`` contexts are kept; registering beyond that evicts the least
+    recently registered or fetched one. Pass None for an unbounded registry.
     """
     
-    def __init__(self):
-        self._contexts: Dict[str, ModelContext] = {}
+    def __init__(self, max_size: Optional[int] = DEFAULT_REGISTRY_SIZE):
+        self.max_size = max_size
+        self._contexts: "OrderedDict[str, ModelContext]" = OrderedDict()
+        # Secondary indexes of context IDs by context type and by model type.
+        # Dicts with None values act as insertion-ordered sets, so listings keep registration order.
+        self._by_context_type: Dict[ContextType, Dict[str, None]] = defaultdict(dict)
+        self._by_model_type: Dict[Optional[ModelType], Dict[str, None]] = defaultdict(dict)
     
     def register(self, context: ModelContext) -> None:
         """Register a new context."""
         if context.context_id in self._contexts:
             logger.warning(f"Context with ID {context.context_id} already exists. Overwriting.")
+            self._unindex(self._contexts[context.context_id])
         
         self._contexts[context.context_id] = context
+        self._contexts.move_to_end(context.context_id)
+        self._by_context_type[context.context_type][context.context_id] = None
+        self._by_model_type[context.model_type][context.context_id] = None
+        
+        if self.max_size is not None and len(self._contexts) > self.max_size:
+            _, evicted = self._contexts.popitem(last=False)
+            self._unindex(evicted)
+    
+    def _unindex(self, context: ModelContext) -> None:
+        self._by_context_type[context.context_type].pop(context.context_id, None)
+        self._by_model_type[context.model_type].pop(context.context_id, None)
     
     def get(self, context_id: str) -> Optional[ModelContext]:
         """Get a context by ID."""
-        return self._contexts.get(context_id)
+        context = self._contexts.get(context_id)
+        if context is not None:
+            self._contexts.move_to_end(context_id)
+        return context
     
     def list(self, 
              context_type: Optional[ContextType] = None,
              model_type: Optional[ModelType] = None) -> List[ModelContext]:
         """List contexts with optional filtering."""
-        results = list(self._contexts.values())
-        
-        if context_type:
-            results = [ctx for ctx in results if ctx.context_type == context_type]
-        
-        if model_type:
-            results = [ctx for ctx in results if ctx.model_type == model_type]
+        if context_type is None and model_type is None:
+            return list(self._contexts.values())
+        if model_type is None:
+            return [self._contexts[i] for i in self._by_context_type.get(context_type, ())]
+        if context_type is None:
+            return [self._contexts[i] for i in self._by_model_type.get(model_type, ())]
         
-        return results
+        # Both filters: one pass over the context type bucket, comparing enum members by identity
+        contexts = self._contexts
+        return [
+            contexts[i] for i in self._by_context_type.get(context_type, ())
+            if contexts[i].model_type is model_type
+        ]
     
     def delete(self, context_id: str) -> bool:
         """Delete a context by ID."""
         if context_id in self._contexts:
-            del self._contexts[context_id]
+            self._unindex(self._contexts.pop(context_id))
             return True
         return False 
 
@@ -4,21 +4,250 @@ Blockchain utility functions for interacting with Solana.
 This module provides utilities to interact with the Solana blockchain,
 particularly for operations related to the MCP token and AI model registry.
 """
+import asyncio
+import base64
 import json
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
+import requests
+from cachetools import TTLCache
 from solana.rpc.api import Client
+from solana.rpc.providers.http import HTTPProvider
+from solana.rpc.async_api import AsyncClient
 from solana.rpc.types import TxOpts
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
-from solana.transaction import Transaction
-from solana.system_program import SYS_PROGRAM_ID
+from solana.transaction import AccountMeta, Transaction
+from solana.system_program import SYS_PROGRAM_ID, TransferParams, transfer as system_transfer
+from spl.token.constants import TOKEN_PROGRAM_ID
+from spl.token.instructions import TransferParams as TokenTransferParams
+from spl.token.instructions import get_associated_token_address, transfer as token_transfer
+
+try:
+    from base58 import b58decode, b58encode
+except ImportError:
+    # Newer solana-py releases depend on based58 instead of base58
+    from based58 import b58decode, b58encode
 
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401 - required by httpx for HTTP/2
+    import httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    logger.warning("httpx[http2] not available. Using HTTP/1.1 RPC transport.")
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Commitment levels in increasing order of finality.
+COMMITMENT_LEVELS = ("processed", "confirmed", "finalized")
+
+# getSignatureStatuses accepts at most 256 signatures per call.
+MAX_SIGNATURE_STATUSES = 256
+
+# getMultipleAccounts accepts at most 100 accounts per call.
+MAX_MULTIPLE_ACCOUNTS = 100
+
+# Background confirmation polls about once per slot and gives up after 30 s.
+CONFIRM_POLL_INTERVAL = 0.4
+CONFIRM_TIMEOUT = 30.0
+
+# HTTP/2 connection limits; streams multiplex within each connection, so
+# these only bound how many sockets the shared client may open at once.
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 100
+
+# Maximum size of a serialized transaction, set by the network packet size
+PACKET_DATA_SIZE = 1232
+
+# Placeholder blockhash used to measure a transaction before it is sent
+_SIZING_BLOCKHASH = "11111111111111111111111111111111"
+
+# Registry reads are cached process-wide, keyed by program and commitment.
+# Entries live for about 15 slots (~6 s), a conservative finality window, so
+# an on-chain update from another client is picked up within a few blocks.
+MODEL_CACHE_SIZE = 10_000
+MODEL_CACHE_TTL = 6.0
+
+# On-chain model registry record: model ID and owner (32 bytes each),
+# status, version and creation timestamp, packed little-endian.
+MODEL_DTYPE = np.dtype([
+    ("model_id", "S32"),
+    ("owner", "S32"),
+    ("status", "u1"),
+    ("version", "<u4"),
+    ("created_at", "<u8"),
+])
+MODEL_STATUS_ACTIVE = 1
+MODEL_STATUS_NAMES = {0: "inactive", MODEL_STATUS_ACTIVE: "active"}
+
+_model_cache = TTLCache(maxsize=MODEL_CACHE_SIZE, ttl=MODEL_CACHE_TTL)
+_model_cache_lock = threading.Lock()
+
+_shared_http_client = None
+_shared_http_client_lock = threading.Lock()
+
+# RPC clients on the shared HTTP client, one per endpoint and decoder
+_CLIENTS: Dict[Tuple[str, bool], Client] = {}
+_clients_lock = threading.Lock()
+
+
+def get_shared_http_client():
+    """
+    Get the process-wide HTTP client used for Solana RPC.
+    
+    With the optional httpx[http2] dependency installed this is a multiplexed
+    HTTP/2 client; otherwise it is a requests session with keep-alive. Either
+    way every shared RPC client posts through it, so connections to an
+    endpoint are reused instead of reopened per request.
+    """
+    global _shared_http_client
+    if _shared_http_client is None:
+        with _shared_http_client_lock:
+            if _shared_http_client is None:
+                _shared_http_client = _new_http_client()
+    return _shared_http_client
+
+
+def _new_http_client():
+    if HTTP2_AVAILABLE:
+        return httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+            ),
+            timeout=30.0,
+        )
+    return requests.Session()
+
+
+@lru_cache(maxsize=5000)
+def _b58(raw: bytes) -> str:
+    return b58encode(raw).decode("ascii")
+
+
+def pubkey_to_base58(pubkey: Union[PublicKey, str]) -> str:
+    """Get the base58 form of a public key, memoized since the same keys recur constantly."""
+    if isinstance(pubkey, str):
+        return pubkey
+    return _b58(bytes(pubkey))
+
+
+def is_transaction_signature(signature: Optional[str]) -> bool:
+    """Whether a value is a base58-encoded 64-byte transaction signature."""
+    if not signature:
+        return False
+    try:
+        return len(b58decode(signature.encode("ascii"))) == 64
+    except ValueError:
+        return False
+
+
+@lru_cache(maxsize=5000)
+def _associated_token_address(owner: bytes, mint: bytes) -> PublicKey:
+    """Derive an associated token account, memoized since the PDA search hashes repeatedly."""
+    return get_associated_token_address(PublicKey(owner), PublicKey(mint))
+
+
+@lru_cache(maxsize=128)
+def _cached_keypair(path: str, mtime: float) -> Keypair:
+    """Read a keypair file; keyed on mtime so an edited file is read again."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    secret_key = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+    return Keypair.from_secret_key(bytes(secret_key))
+
+
+def _load_keypair(path: str) -> Keypair:
+    """Load keypair from file."""
+    try:
+        return _cached_keypair(path, os.stat(path).st_mtime)
+    except Exception as e:
+        logger.error("Error loading keypair: %s", e)
+        raise
+
+
+def _encode_request(body: Any, fast_json: bool = False) -> Union[bytes, str]:
+    """Encode a JSON-RPC request body, with orjson when requested and installed."""
+    if fast_json and ORJSON_AVAILABLE:
+        return orjson.dumps(body)
+    return json.dumps(body)
+
+
+def _decode_response(raw_response, fast_json: bool = False) -> Any:
+    """Decode a JSON-RPC HTTP response body, with orjson when requested and installed."""
+    if fast_json and ORJSON_AVAILABLE:
+        return orjson.loads(raw_response.content)
+    return raw_response.json()
+
+
+class SessionHTTPProvider(HTTPProvider):
+    """
+    solana-py HTTP provider that posts through a long-lived HTTP session.
+    
+    The stock provider calls ``requests.post`` for every request, opening a
+    new TCP+TLS connection each time. This one reuses the given httpx client
+    (HTTP/2) or requests session (HTTP/1.1 keep-alive).
+    """
+    
+    def __init__(self, endpoint: str, http_client: Any, fast_json: bool = False, timeout: float = 30.0):
+        super().__init__(endpoint, timeout=timeout)
+        self.http_client = http_client
+        self.fast_json = fast_json
+    
+    def json_encode(self, obj, cls=None):
+        if self.fast_json and ORJSON_AVAILABLE and cls is None:
+            try:
+                return orjson.dumps(obj)
+            except TypeError:
+                pass
+        return super().json_encode(obj, cls=cls)
+    
+    def make_request(self, method, *params):
+        request_kwargs = self._before_request(method=method, params=params, is_async=False)
+        if HTTP2_AVAILABLE and isinstance(self.http_client, httpx.Client):
+            request_kwargs["content"] = request_kwargs.pop("data")
+        else:
+            request_kwargs["timeout"] = self.timeout
+        raw_response = self.http_client.post(**request_kwargs)
+        if self.fast_json and ORJSON_AVAILABLE:
+            raw_response.raise_for_status()
+            return _decode_response(raw_response, fast_json=True)
+        return self._after_request(raw_response=raw_response, method=method)
+
+
+def _new_client(rpc_url: str, http_client: Any, fast_json: bool = False) -> Client:
+    client = Client(rpc_url, timeout=30)
+    client._provider = SessionHTTPProvider(rpc_url, http_client, fast_json=fast_json)
+    return client
+
+
+def _get_client(rpc_url: str, fast_json: bool = False) -> Client:
+    """Get the process-wide RPC client for an endpoint, creating it on first use."""
+    key = (rpc_url, fast_json)
+    client = _CLIENTS.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _CLIENTS.get(key)
+            if client is None:
+                client = _CLIENTS[key] = _new_client(rpc_url, get_shared_http_client(), fast_json)
+    return client
+
 
 @dataclass
 class SolanaConfig:
@@ -27,6 +256,8 @@ class SolanaConfig:
     rpc_url: str = "https://api.devnet.solana.com"
     keypair_path: Optional[str] = None
     commitment: str = "confirmed"
+    # Decode RPC responses with orjson instead of the stdlib json module
+    use_fast_json: bool = False
 
 
 class SolanaConnection:
@@ -38,34 +269,89 @@ class SolanaConnection:
 # processes data for the system: This function processes data for the system
 # __init__: This function processes data for the system
     # Modified: 2025-04-26T22:17:21.344982
-    def __init__(self, config: SolanaConfig):
+    def __init__(self,
+                 config: SolanaConfig,
+                 http_client: Optional[Any] = None,
+                 shared: bool = True):
+        """
+        Connect to the RPC endpoint in ``config``.
+        
+        By default the process-wide HTTP session and RPC client for the
+        endpoint are reused. Pass ``shared=False`` for a connection with its
+        own session and client, e.g. to replace one that keeps failing.
+        """
         self.config = config
-        self.client = Client(config.rpc_url)
-        self.keypair = self._load_keypair() if config.keypair_path else None
+        if http_client is None and shared:
+            self.http_client = get_shared_http_client()
+            self.client = _get_client(config.rpc_url, config.use_fast_json)
+        else:
+            self.http_client = http_client or _new_http_client()
+            self.client = self._create_client()
+        self._local = threading.local()
+        self._send_executor: Optional[ThreadPoolExecutor] = None
+        self._send_executor_lock = threading.Lock()
+        self.keypair = _load_keypair(config.keypair_path) if config.keypair_path else None
+        # The keypair never changes, so encode its public key once
+        self._pubkey = self.keypair.public_key if self.keypair else None
+        self._pubkey_str = pubkey_to_base58(self._pubkey) if self._pubkey else None
+        # Transfers from our own keypair only differ in recipient and amount
+        self._transfer_template = system_transfer(TransferParams(
+            from_pubkey=self._pubkey,
+            to_pubkey=PublicKey(0),
+            lamports=0
+        )) if self._pubkey else None
     
-    def _load_keypair(self) -> Keypair:
-        """Load keypair from file."""
-        try:
-            with open(self.config.keypair_path, "r") as f:
-                secret_key = json.load(f)
-            return Keypair.from_secret_key(bytes(secret_key))
-        except Exception as e:
-            logger.error(f"Error loading keypair: {str(e)}")
-            raise
+    def _create_client(self) -> Client:
+        return _new_client(self.config.rpc_url, self.http_client, self.config.use_fast_json)
+    
+    def _thread_client(self) -> Client:
+        """
+        Get a Client owned by the calling thread.
+        
+        A requests session is not safe to share between threads, so on
+        HTTP/1.1 each thread gets its own. An httpx client is thread-safe and
+        multiplexes requests, so on HTTP/2 threads keep sharing it.
+        """
+        client = getattr(self._local, "client", None)
+        if client is None:
+            if HTTP2_AVAILABLE and isinstance(self.http_client, httpx.Client):
+                http_client = self.http_client
+            else:
+                http_client = requests.Session()
+            client = self._local.client = _new_client(
+                self.config.rpc_url,
+                http_client,
+                self.config.use_fast_json
+            )
+        return client
+    
+    def _get_send_executor(self, max_workers: int) -> ThreadPoolExecutor:
+        """Get the worker pool for parallel sends, kept across calls so worker clients are reused."""
+        with self._send_executor_lock:
+            executor = self._send_executor
+            if executor is None or executor._max_workers != max_workers:
+                if executor is not None:
+                    executor.shutdown(wait=False)
+                executor = self._send_executor = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix="solana-send"
+                )
+            return executor
     
-    def get_balance(self, pubkey: Optional[PublicKey] = None) -> int:
+    def get_balance(self, pubkey: Optional[Union[PublicKey, str]] = None) -> int:
         """Get balance for the given public key."""
         if pubkey is None:
             if self.keypair is None:
                 raise ValueError("No keypair or public key provided")
-            pubkey = self.keypair.public_key
+            pubkey = self._pubkey_str
         
         resp = self.client.get_balance(pubkey)
-        if "result" in resp and "value" in resp["result"]:
-            return resp["result"]["value"]
-        else:
-            logger.error(f"Error getting balance: {resp}")
-            return 0
+        result = resp.get("result")
+        value = result.get("value") if result is not None else None
+        if value is not None:
+            return value
+        logger.error("Error getting balance: %s", resp)
+        return 0
     
     def request_airdrop(self, amount: int = 1_000_000_000) -> Optional[str]:
         """Request an airdrop of SOL."""
@@ -73,16 +359,16 @@ class SolanaConnection:
             raise ValueError("No keypair loaded")
         
         resp = self.client.request_airdrop(
-            self.keypair.public_key,
+            self._pubkey_str,
             amount,
             commitment=self.config.commitment
         )
         
-        if "result" in resp:
-            return resp["result"]
-        else:
-            logger.error(f"Error requesting airdrop: {resp}")
-            return None
+        signature = resp.get("result")
+        if signature is not None:
+            return signature
+        logger.error("Error requesting airdrop: %s", resp)
+        return None
     
     def transfer(self, 
                 recipient: PublicKey, 
@@ -94,9 +380,320 @@ class SolanaConnection:
                 raise ValueError("No keypair loaded")
             sender = self.keypair
         
+        transaction = self.build_transfer_transaction(recipient, amount, sender)
+        return self._send_transaction(transaction, sender)
+    
+    def fast_transfer(self, recipient: PublicKey, amount: int) -> Optional[str]:
+        """
+        Transfer SOL from the loaded keypair by patching a prebuilt instruction.
+        
+        Equivalent to ``transfer(recipient, amount)``, but only the recipient
+        account and the lamports field are replaced per call, which keeps
+        bulk sends from one wallet cheap.
+        """
+        template = self._transfer_template
+        if template is None:
+            raise ValueError("No keypair loaded")
+        
+        # System transfer data is a u32 instruction index then u64 lamports
+        instruction = template._replace(
+            keys=[template.keys[0], AccountMeta(pubkey=recipient, is_signer=False, is_writable=True)],
+            data=template.data[:4] + amount.to_bytes(8, "little")
+        )
+        transaction = Transaction(fee_payer=self._pubkey)
+        transaction.instructions.append(instruction)
+        return self._send_transaction(transaction, self.keypair)
+    
+    def _send_transaction(self, transaction: Transaction, sender: Keypair) -> Optional[str]:
+        try:
+            resp = self.client.send_transaction(
+                transaction,
+                sender,
+                opts=TxOpts(skip_preflight=False, preflight_commitment=self.config.commitment)
+            )
+            
+            signature = resp.get("result")
+            if signature is not None:
+                return signature
+            logger.error("Error sending transaction: %s", resp)
+            return None
+        except Exception as e:
+            logger.exception("Error sending transaction: %s", e)
+            return None
+    
+    def transfer_batch(self,
+                       recipients: Sequence[PublicKey],
+                       amounts: Sequence[int],
+                       sender: Optional[Keypair] = None,
+                       timeout: float = 30.0) -> List[Optional[str]]:
+        """Transfer SOL to many recipients using batched submission and confirmation."""
+        if len(recipients) != len(amounts):
+            raise ValueError("recipients and amounts must have the same length")
+        if sender is None:
+            if self.keypair is None:
+                raise ValueError("No keypair loaded")
+            sender = self.keypair
+        
+        transactions = [
+            self.build_transfer_transaction(recipient, amount, sender)
+            for recipient, amount in zip(recipients, amounts)
+        ]
+        
+        try:
+            signatures = self.send_multiple_transactions_unconfirmed(transactions, sender)
+            statuses = self.confirm_transactions(
+                [sig for sig in signatures if sig is not None],
+                timeout=timeout
+            )
+        except Exception as e:
+            logger.exception("Error sending transaction batch: %s", e)
+            return [None] * len(transactions)
+        
+        return [sig if sig is not None and statuses.get(sig) else None for sig in signatures]
+    
+    def send_transactions_parallel(self,
+                                   transactions: Sequence[Transaction],
+                                   sender: Optional[Keypair] = None,
+                                   max_workers: int = 16) -> List[Optional[str]]:
+        """
+        Sign and submit transactions concurrently, one sendTransaction call each.
+        
+        Unlike send_multiple_transactions_unconfirmed this does not rely on the
+        endpoint supporting JSON-RPC batches, and a slow call only delays its
+        own worker. Returns the signature for each transaction, or None where
+        it was rejected.
+        """
+        if sender is None:
+            if self.keypair is None:
+                raise ValueError("No keypair loaded")
+            sender = self.keypair
+        if not transactions:
+            return []
+        
+        wire_transactions = self.sign_transactions(transactions, sender)
+        opts = TxOpts(skip_preflight=False, preflight_commitment=self.config.commitment)
+        
+        def send(wire_transaction: bytes) -> Optional[str]:
+            try:
+                resp = self._thread_client().send_raw_transaction(wire_transaction, opts=opts)
+            except Exception as e:
+                logger.error("Error sending transaction: %s", e)
+                return None
+            if "result" in resp:
+                return resp["result"]
+            logger.error("Error sending transaction: %s", resp)
+            return None
+        
+        return list(self._get_send_executor(max_workers).map(send, wire_transactions))
+    
+    def batch_rpc(self, calls: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Send several JSON-RPC calls in a single HTTP request.
+        
+        Each call is a ``{"method": ..., "params": [...]}`` dict. Responses are
+        matched back to their call by ``id`` and returned in call order.
+        """
+        if not calls:
+            return []
+        
+        body = [
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": call["method"],
+                "params": call.get("params", []),
+            }
+            for i, call in enumerate(calls)
+        ]
+        data = _encode_request(body, self.config.use_fast_json)
+        # httpx takes a raw body as content=, requests as data=
+        data_kwarg = "content" if HTTP2_AVAILABLE and isinstance(self.http_client, httpx.Client) else "data"
+        raw = self.http_client.post(
+            self.config.rpc_url,
+            headers={"Content-Type": "application/json"},
+            **{data_kwarg: data}
+        )
+        raw.raise_for_status()
+        payload = _decode_response(raw, self.config.use_fast_json)
+        
+        # Endpoints without batch support answer with a single error object
+        if isinstance(payload, dict):
+            return [payload] * len(calls)
+        
+        by_id = {item.get("id"): item for item in payload}
+        missing = {"error": {"message": "No response for request"}}
+        return [by_id.get(i, missing) for i in range(len(calls))]
+    
+    def get_latest_blockhash(self) -> str:
+        """Get the latest blockhash at the configured commitment."""
+        resp = self.batch_rpc([{
+            "method": "getLatestBlockhash",
+            "params": [{"commitment": self.config.commitment}],
+        }])[0]
+        if "result" not in resp:
+            raise RuntimeError(f"Error getting latest blockhash: {resp}")
+        return resp["result"]["value"]["blockhash"]
+    
+    def get_multiple_accounts(self, pubkeys: Sequence[Union[PublicKey, str]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get account info for several accounts in as few RPC calls as possible.
+        
+        Returns one entry per pubkey, in order: the account info dict, or None
+        if the account does not exist or could not be fetched.
+        """
+        keys = [pubkey_to_base58(pubkey) for pubkey in pubkeys]
+        calls = [
+            {
+                "method": "getMultipleAccounts",
+                "params": [
+                    keys[i:i + MAX_MULTIPLE_ACCOUNTS],
+                    {"commitment": self.config.commitment, "encoding": "base64"},
+                ],
+            }
+            for i in range(0, len(keys), MAX_MULTIPLE_ACCOUNTS)
+        ]
+        
+        accounts: List[Optional[Dict[str, Any]]] = []
+        for call, resp in zip(calls, self.batch_rpc(calls)):
+            if "result" in resp:
+                accounts.extend(resp["result"]["value"])
+            else:
+                logger.error("Error getting accounts: %s", resp.get("error"))
+                accounts.extend([None] * len(call["params"][0]))
+        return accounts
+    
+    def get_multiple_balances(self, pubkeys: Sequence[PublicKey]) -> Dict[PublicKey, int]:
+        """
+        Get balances for several public keys with batched getMultipleAccounts calls.
+        
+        Accounts that do not exist, or could not be fetched, report a balance of 0.
+        """
+        accounts = self.get_multiple_accounts(pubkeys)
+        return {
+            pubkey: account["lamports"] if account else 0
+            for pubkey, account in zip(pubkeys, accounts)
+        }
+    
+    def send_multiple_transactions_unconfirmed(self,
+                                               transactions: Sequence[Transaction],
+                                               sender: Keypair) -> List[Optional[str]]:
+        """
+        Sign and submit transactions in one JSON-RPC batch without waiting for confirmation.
+        
+        Returns the signature for each transaction, or None where the node rejected it.
+        """
+        return self.send_raw_transactions(self.sign_transactions(transactions, sender))
+    
+    def sign_transactions(self,
+                          transactions: Sequence[Transaction],
+                          sender: Keypair) -> List[bytes]:
+        """Sign transactions against one freshly fetched blockhash and serialize them."""
+        if not transactions:
+            return []
+        
+        blockhash = self.get_latest_blockhash()
+        wire_transactions = []
+        for transaction in transactions:
+            transaction.recent_blockhash = blockhash
+            transaction.sign(sender)
+            wire_transactions.append(transaction.serialize())
+        return wire_transactions
+    
+    def send_raw_transactions(self, wire_transactions: Sequence[bytes]) -> List[Optional[str]]:
+        """
+        Submit signed, serialized transactions in one JSON-RPC batch.
+        
+        Resending the same bytes is safe: a transaction the node has already
+        processed is reported by its signature rather than as a failure.
+        Returns the signature for each transaction, or None where the node
+        rejected it.
+        """
+        if not wire_transactions:
+            return []
+        
+        calls = [
+            {
+                "method": "sendTransaction",
+                "params": [
+                    base64.b64encode(wire_transaction).decode("ascii"),
+                    {
+                        "encoding": "base64",
+                        "skipPreflight": False,
+                        "preflightCommitment": self.config.commitment,
+                    },
+                ],
+            }
+            for wire_transaction in wire_transactions
+        ]
+        
+        signatures = []
+        for wire_transaction, resp in zip(wire_transactions, self.batch_rpc(calls)):
+            signature = resp.get("result")
+            if signature is None and "already been processed" in str(resp.get("error")):
+                # The first signature follows the one-byte signature count
+                signature = _b58(bytes(wire_transaction[1:65]))
+            if signature is None:
+                logger.error("Error sending transaction: %s", resp)
+            signatures.append(signature)
+        return signatures
+    
+    def confirm_transactions(self,
+                             signatures: Sequence[str],
+                             timeout: float = 30.0,
+                             poll_interval: float = 0.5) -> Dict[str, bool]:
+        """
+        Wait for signatures to reach the configured commitment.
+        
+        Statuses are polled with batched ``getSignatureStatuses`` calls. Returns a
+        mapping of signature to whether it was confirmed without error.
+        """
+        required = COMMITMENT_LEVELS.index(self.config.commitment)
+        results = {sig: False for sig in signatures}
+        pending = list(results)
+        deadline = time.monotonic() + timeout
+        
+        while pending:
+            chunks = [
+                pending[i:i + MAX_SIGNATURE_STATUSES]
+                for i in range(0, len(pending), MAX_SIGNATURE_STATUSES)
+            ]
+            responses = self.batch_rpc([
+                {"method": "getSignatureStatuses", "params": [chunk]} for chunk in chunks
+            ])
+            
+            still_pending = []
+            for chunk, resp in zip(chunks, responses):
+                if "result" not in resp:
+                    logger.error("Error getting signature statuses: %s", resp)
+                    still_pending.extend(chunk)
+                    continue
+                for sig, status in zip(chunk, resp["result"]["value"]):
+                    if status is None:
+                        still_pending.append(sig)
+                    elif status.get("err") is not None:
+                        logger.error("Transaction %s failed: %s", sig, status["err"])
+                    elif COMMITMENT_LEVELS.index(status.get("confirmationStatus") or "processed") >= required:
+                        results[sig] = True
+                    else:
+                        still_pending.append(sig)
+            
+            pending = still_pending
+            if pending and time.monotonic() >= deadline:
+                logger.error("Timed out waiting for %s transactions to confirm", len(pending))
+                break
+            if pending:
+                time.sleep(poll_interval)
+        
+        return results
+    
+    @staticmethod
+    def build_transfer_transaction(recipient: PublicKey,
+                                    amount: int,
+                                    sender: Keypair) -> Transaction:
+        """Build an unsigned SOL transfer transaction."""
         transaction = Transaction()
         transaction.add(
-            SYS_PROGRAM_ID.transfer(
+            system_transfer(
                 TransferParams(
                     from_pubkey=sender.public_key,
                     to_pubkey=recipient,
@@ -104,22 +701,192 @@ class SolanaConnection:
                 )
             )
         )
+        return transaction
+
+
+class AsyncSolanaConnection:
+    """
+    Non-blocking connection to the Solana blockchain.
+    
+    Mirrors the basic SolanaConnection operations as coroutines, so many RPCs
+    can be in flight at once, e.g.
+    ``await asyncio.gather(*(conn.get_balance(pk) for pk in pubkeys))``.
+    """
+    
+    def __init__(self, config: SolanaConfig):
+        self.config = config
+        self.client = AsyncClient(config.rpc_url)
+        self.keypair = _load_keypair(config.keypair_path) if config.keypair_path else None
+        self._pubkey = self.keypair.public_key if self.keypair else None
+        self._pubkey_str = pubkey_to_base58(self._pubkey) if self._pubkey else None
+        self._pending: Dict[str, Tuple["asyncio.Future[bool]", float]] = {}
+        self._confirm_task: Optional["asyncio.Task[None]"] = None
+    
+    async def __aenter__(self) -> "AsyncSolanaConnection":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    async def close(self) -> None:
+        """Stop background confirmation and close the underlying HTTP session."""
+        if self._confirm_task is not None:
+            self._confirm_task.cancel()
+            self._confirm_task = None
+        for future, _ in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        await self.client.close()
+    
+    async def get_balance(self, pubkey: Optional[Union[PublicKey, str]] = None) -> int:
+        """Get balance for the given public key."""
+        if pubkey is None:
+            if self.keypair is None:
+                raise ValueError("No keypair or public key provided")
+            pubkey = self._pubkey_str
+        
+        resp = await self.client.get_balance(pubkey)
+        result = resp.get("result")
+        value = result.get("value") if result is not None else None
+        if value is not None:
+            return value
+        logger.error("Error getting balance: %s", resp)
+        return 0
+    
+    async def request_airdrop(self, amount: int = 1_000_000_000) -> Optional[str]:
+        """Request an airdrop of SOL."""
+        if self.keypair is None:
+            raise ValueError("No keypair loaded")
+        
+        resp = await self.client.request_airdrop(
+            self._pubkey_str,
+            amount,
+            commitment=self.config.commitment
+        )
+        
+        signature = resp.get("result")
+        if signature is not None:
+            return signature
+        logger.error("Error requesting airdrop: %s", resp)
+        return None
+    
+    async def transfer(self,
+                       recipient: PublicKey,
+                       amount: int,
+                       sender: Optional[Keypair] = None) -> Optional[str]:
+        """Transfer SOL to the recipient."""
+        if sender is None:
+            if self.keypair is None:
+                raise ValueError("No keypair loaded")
+            sender = self.keypair
+        
+        transaction = SolanaConnection.build_transfer_transaction(recipient, amount, sender)
         
         try:
-            resp = self.client.send_transaction(
+            resp = await self.client.send_transaction(
                 transaction,
                 sender,
                 opts=TxOpts(skip_preflight=False, preflight_commitment=self.config.commitment)
             )
             
-            if "result" in resp:
-                return resp["result"]
-            else:
-                logger.error(f"Error sending transaction: {resp}")
-                return None
+            signature = resp.get("result")
+            if signature is not None:
+                return signature
+            logger.error("Error sending transaction: %s", resp)
+            return None
+        except Exception as e:
+            logger.exception("Error sending transaction: %s", e)
+            return None
+    
+    async def transfer_async(self,
+                             recipient: PublicKey,
+                             amount: int,
+                             sender: Optional[Keypair] = None,
+                             wait_for_commit: bool = False) -> Optional[str]:
+        """
+        Submit a SOL transfer without waiting for it to be confirmed.
+        
+        Preflight is skipped and the signature is returned as soon as the node
+        accepts the transaction; confirmation is tracked in the background and
+        can be awaited later with ``confirmation(signature)``. With
+        ``wait_for_commit`` the signature is only returned once confirmed.
+        """
+        if sender is None:
+            if self.keypair is None:
+                raise ValueError("No keypair loaded")
+            sender = self.keypair
+        
+        transaction = SolanaConnection.build_transfer_transaction(recipient, amount, sender)
+        
+        try:
+            resp = await self.client.send_transaction(
+                transaction,
+                sender,
+                opts=TxOpts(skip_preflight=True, preflight_commitment=self.config.commitment)
+            )
         except Exception as e:
-            logger.exception(f"Error sending transaction: {str(e)}")
+            logger.exception("Error sending transaction: %s", e)
+            return None
+        if "result" not in resp:
+            logger.error("Error sending transaction: %s", resp)
             return None
+        
+        signature = resp["result"]
+        confirmed = self._track(signature)
+        if wait_for_commit and not await confirmed:
+            return None
+        return signature
+    
+    def confirmation(self, signature: str) -> "asyncio.Future[bool]":
+        """
+        Get a future resolving to whether a submitted signature was confirmed.
+        
+        Resolves to False if the transaction failed or was not confirmed
+        within CONFIRM_TIMEOUT seconds.
+        """
+        return self._track(signature)
+    
+    def _track(self, signature: str) -> "asyncio.Future[bool]":
+        if signature in self._pending:
+            return self._pending[signature][0]
+        future = asyncio.get_running_loop().create_future()
+        self._pending[signature] = (future, time.monotonic() + CONFIRM_TIMEOUT)
+        if self._confirm_task is None or self._confirm_task.done():
+            self._confirm_task = asyncio.ensure_future(self._confirm_pending())
+        return future
+    
+    async def _confirm_pending(self) -> None:
+        """Poll statuses of all tracked signatures in batches until none remain."""
+        required = COMMITMENT_LEVELS.index(self.config.commitment)
+        while self._pending:
+            await asyncio.sleep(CONFIRM_POLL_INTERVAL)
+            signatures = list(self._pending)
+            for i in range(0, len(signatures), MAX_SIGNATURE_STATUSES):
+                chunk = signatures[i:i + MAX_SIGNATURE_STATUSES]
+                try:
+                    resp = await self.client.get_signature_statuses(chunk)
+                    statuses = resp["result"]["value"]
+                except Exception as e:
+                    logger.warning("Error getting signature statuses: %s", e)
+                    statuses = [None] * len(chunk)
+                
+                now = time.monotonic()
+                for sig, status in zip(chunk, statuses):
+                    future, deadline = self._pending[sig]
+                    if status is not None and status.get("err") is not None:
+                        logger.error("Transaction %s failed: %s", sig, status["err"])
+                        result = False
+                    elif status is not None and COMMITMENT_LEVELS.index(
+                            status.get("confirmationStatus") or "processed") >= required:
+                        result = True
+                    elif now >= deadline:
+                        logger.error("Timed out waiting for transaction %s to confirm", sig)
+                        result = False
+                    else:
+                        continue
+                    del self._pending[sig]
+                    if not future.done():
+                        future.set_result(result)
 
 
 class MCPTokenClient:
@@ -127,17 +894,20 @@ class MCPTokenClient:
     
     def __init__(self, 
                  connection: SolanaConnection,
-                 program_id: PublicKey,
-                 token_mint: PublicKey):
+                 program_id: Union[PublicKey, str],
+                 token_mint: Union[PublicKey, str]):
         self.connection = connection
-        self.program_id = program_id
-        self.token_mint = token_mint
+        # Decode base58 input once; instructions are built from the raw bytes
+        self._program_id_bytes = bytes(program_id if isinstance(program_id, PublicKey) else PublicKey(program_id))
+        self._token_mint_bytes = bytes(token_mint if isinstance(token_mint, PublicKey) else PublicKey(token_mint))
+        self.program_id = PublicKey(self._program_id_bytes)
+        self.token_mint = PublicKey(self._token_mint_bytes)
     
     def mint_tokens(self, recipient: PublicKey, amount: int) -> Optional[str]:
         """Mint MCP tokens to the recipient."""
         # Implementation would depend on the specific Solana program structure
         # This is a placeholder for the actual implementation
-        logger.info(f"Minting {amount} tokens to {recipient}")
+        logger.info("Minting %s tokens to %s", amount, pubkey_to_base58(recipient))
         return "tx_signature_placeholder"
     
     def transfer_tokens(self, 
@@ -152,8 +922,123 @@ class MCPTokenClient:
                 raise ValueError("No keypair loaded")
             sender = self.connection.keypair
         
-        logger.info(f"Transferring {amount} tokens from {sender.public_key} to {recipient}")
+        logger.info(
+            "Transferring %s tokens from %s to %s",
+            amount,
+            pubkey_to_base58(sender.public_key),
+            pubkey_to_base58(recipient)
+        )
         return "tx_signature_placeholder"
+    
+    def transfer_tokens_batch(self,
+                              recipients: Sequence[PublicKey],
+                              amounts: Sequence[int],
+                              sender: Optional[Keypair] = None,
+                              timeout: float = 30.0) -> List[Optional[str]]:
+        """
+        Transfer MCP tokens to many recipients, one transaction per transfer.
+        
+        All transactions are submitted in one JSON-RPC batch and confirmed
+        together. Returns the signature of each confirmed transfer, or None
+        where it was rejected or not confirmed within ``timeout``.
+        """
+        if len(recipients) != len(amounts):
+            raise ValueError("recipients and amounts must have the same length")
+        if sender is None:
+            if self.connection.keypair is None:
+                raise ValueError("No keypair loaded")
+            sender = self.connection.keypair
+        if not recipients:
+            return []
+        
+        source = _associated_token_address(bytes(sender.public_key), self._token_mint_bytes)
+        transactions = []
+        for recipient, amount in zip(recipients, amounts):
+            transaction = Transaction(fee_payer=sender.public_key)
+            transaction.add(self._transfer_instruction(source, recipient, amount, sender))
+            transactions.append(transaction)
+        
+        logger.info(
+            "Transferring tokens from %s to %s recipients",
+            pubkey_to_base58(sender.public_key),
+            len(recipients)
+        )
+        try:
+            signatures = self.connection.send_multiple_transactions_unconfirmed(transactions, sender)
+            statuses = self.connection.confirm_transactions(
+                [sig for sig in signatures if sig is not None],
+                timeout=timeout
+            )
+        except Exception as e:
+            logger.exception("Error sending token transfer batch: %s", e)
+            return [None] * len(transactions)
+        
+        return [sig if sig is not None and statuses.get(sig) else None for sig in signatures]
+    
+    def transfer_tokens_bulk(self,
+                             transfers: Sequence[Tuple[PublicKey, int]],
+                             sender: Optional[Keypair] = None) -> List[Optional[str]]:
+        """
+        Transfer MCP tokens to many recipients using as few transactions as possible.
+        
+        Transfer instructions between the associated token accounts of the
+        sender and each recipient are packed into one transaction until the
+        next one would exceed PACKET_DATA_SIZE, and all transactions are sent
+        in a single JSON-RPC batch. Returns, for each transfer, the signature
+        of the transaction that carries it, or None where it was rejected.
+        """
+        if sender is None:
+            if self.connection.keypair is None:
+                raise ValueError("No keypair loaded")
+            sender = self.connection.keypair
+        if not transfers:
+            return []
+        
+        source = _associated_token_address(bytes(sender.public_key), self._token_mint_bytes)
+        transactions: List[Transaction] = []
+        packet_of: List[int] = []
+        transaction = None
+        for recipient, amount in transfers:
+            instruction = self._transfer_instruction(source, recipient, amount, sender)
+            if transaction is not None:
+                transaction.add(instruction)
+                if self._wire_size(transaction) > PACKET_DATA_SIZE:
+                    transaction.instructions.pop()
+                    transaction = None
+            if transaction is None:
+                transaction = Transaction(fee_payer=sender.public_key, recent_blockhash=_SIZING_BLOCKHASH)
+                transaction.add(instruction)
+                transactions.append(transaction)
+            packet_of.append(len(transactions) - 1)
+        
+        logger.info(
+            "Transferring tokens from %s to %s recipients in %s transactions",
+            pubkey_to_base58(sender.public_key),
+            len(transfers),
+            len(transactions)
+        )
+        signatures = self.connection.send_multiple_transactions_unconfirmed(transactions, sender)
+        return [signatures[i] for i in packet_of]
+    
+    def _transfer_instruction(self,
+                              source: PublicKey,
+                              recipient: PublicKey,
+                              amount: int,
+                              sender: Keypair):
+        """Build an SPL transfer between the sender's and recipient's associated token accounts."""
+        return token_transfer(TokenTransferParams(
+            program_id=TOKEN_PROGRAM_ID,
+            source=source,
+            dest=_associated_token_address(bytes(recipient), self._token_mint_bytes),
+            owner=sender.public_key,
+            amount=amount
+        ))
+    
+    @staticmethod
+    def _wire_size(transaction: Transaction) -> int:
+        """Serialized size of a transaction with a single signer."""
+        # One-byte signature count, one 64-byte signature, then the message
+        return 1 + 64 + len(transaction.serialize_message())
 
 
 class ModelRegistryClient:
@@ -171,25 +1056,118 @@ class ModelRegistryClient:
         """Register a new AI model in the registry."""
         # Implementation would depend on the specific Solana program structure
         # This is a placeholder for the actual implementation
-        logger.info(f"Registering model {model_id}")
-        return "tx_signature_placeholder"
+        logger.info("Registering model %s", model_id)
+        tx_sig = "tx_signature_placeholder"
+        if tx_sig:
+            self.invalidate_cache(model_id)
+        return tx_sig
+    
+    async def register_model_async(self,
+                                   model_id: str,
+                                   model_data: Dict[str, Any]) -> Optional[str]:
+        """Register a model without blocking the event loop, so several can be submitted at once."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.register_model, model_id, model_data)
     
     def get_model_data(self, model_id: str) -> Optional[Dict[str, Any]]:
         """Get data for a registered AI model."""
-        # Implementation would depend on the specific Solana program structure
-        # This is a placeholder for the actual implementation
-        logger.info(f"Getting data for model {model_id}")
-        return {"model_id": model_id, "status": "active"}
+        key = (pubkey_to_base58(self.program_id), model_id, self.connection.config.commitment)
+        with _model_cache_lock:
+            cached = _model_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        
+        model_data = self._fetch_model_data(model_id)
+        if model_data is not None:
+            with _model_cache_lock:
+                _model_cache[key] = dict(model_data)
+        return model_data
     
     def list_models(self) -> List[Dict[str, Any]]:
         """List all registered AI models."""
+        return _model_rows_to_dicts(self._model_rows())
+    
+    def list_active_models(self) -> List[Dict[str, Any]]:
+        """List registered AI models whose status is active."""
+        rows = self._model_rows()
+        return _model_rows_to_dicts(rows[rows["status"] == MODEL_STATUS_ACTIVE])
+    
+    def _model_rows(self) -> np.ndarray:
+        """Get every model record as a MODEL_DTYPE array, through the registry cache."""
+        key = (pubkey_to_base58(self.program_id), None, self.connection.config.commitment)
+        with _model_cache_lock:
+            cached = _model_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        rows = self._fetch_models()
+        if rows is None:
+            # Errors are not cached, so the next call retries the RPC
+            return np.empty(0, dtype=MODEL_DTYPE)
+        # Cached rows are shared between callers
+        rows.flags.writeable = False
+        with _model_cache_lock:
+            _model_cache[key] = rows
+        return rows
+    
+    def invalidate_cache(self, model_id: Optional[str] = None) -> None:
+        """Drop cached registry reads for this program, or for a single model and the model list."""
+        program_id = pubkey_to_base58(self.program_id)
+        with _model_cache_lock:
+            for key in list(_model_cache.keys()):
+                if key[0] == program_id and (model_id is None or key[1] in (model_id, None)):
+                    _model_cache.pop(key, None)
+    
+    def _fetch_model_data(self, model_id: str) -> Optional[Dict[str, Any]]:
+        """Read a model's data from the chain."""
         # Implementation would depend on the specific Solana program structure
         # This is a placeholder for the actual implementation
+        logger.info("Getting data for model %s", model_id)
+        return {"model_id": model_id, "status": "active"}
+    
+    def _fetch_models(self) -> Optional[np.ndarray]:
+        """Read all registered models from the chain with a single getProgramAccounts call, or None on error."""
         logger.info("Listing all models")
-        return [
-            {"model_id": "model1", "status": "active"},
-            {"model_id": "model2", "status": "inactive"},
-        ] 
+        resp = self.connection.batch_rpc([{
+            "method": "getProgramAccounts",
+            "params": [
+                pubkey_to_base58(self.program_id),
+                {
+                    "commitment": self.connection.config.commitment,
+                    "encoding": "base64",
+                    # Only model records, so other program accounts never cross the wire
+                    "filters": [{"dataSize": MODEL_DTYPE.itemsize}],
+                },
+            ],
+        }])[0]
+        result = resp.get("result")
+        if result is None:
+            logger.error("Error listing models: %s", resp.get("error"))
+            return None
+        
+        # Every record has the same size, so the concatenated data parses in one pass
+        data = b"".join(base64.b64decode(item["account"]["data"][0]) for item in result)
+        return np.frombuffer(data, dtype=MODEL_DTYPE)
+
+
+def _model_rows_to_dicts(rows: np.ndarray) -> List[Dict[str, Any]]:
+    """Convert MODEL_DTYPE records to plain dictionaries."""
+    return [
+        {
+            "model_id": model_id.decode("utf-8"),
+            "owner": _b58(owner.ljust(32, b"\0")),
+            "status": MODEL_STATUS_NAMES.get(status, "unknown"),
+            "version": version,
+            "created_at": created_at,
+        }
+        for model_id, owner, status, version, created_at in zip(
+            rows["model_id"].tolist(),
+            rows["owner"].tolist(),
+            rows["status"].tolist(),
+            rows["version"].tolist(),
+            rows["created_at"].tolist(),
+        )
+    ]
 
 
 def optimize_inference(data):
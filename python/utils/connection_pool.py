@@ -0,0 +1,252 @@
+"""
+Connection pooling and queued transaction submission for Solana.
+
+This module provides a fixed-size pool of Solana connections and a
+priority queue that flushes pending transactions in small batches through
+the pooled connections.
+"""
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from solana.keypair import Keypair
+from solana.transaction import Transaction
+
+from .blockchain import SolanaConfig, SolanaConnection
+
+logger = logging.getLogger(__name__)
+
+# Conservative lifetime of a signed transaction: a blockhash stays valid for
+# 150 blocks, a little over a minute at typical slot times.
+BLOCKHASH_VALIDITY = 60.0
+
+
+def _private_connection(config: SolanaConfig) -> SolanaConnection:
+    """Create a connection that does not share its session, so eviction really replaces it."""
+    return SolanaConnection(config, shared=False)
+
+
+class TransactionPriority(IntEnum):
+    """Priority of a queued transaction. Lower values are sent first."""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class SolanaConnectionPool:
+    """
+    Fixed-size pool of Solana connections.
+
+    Connections that accumulate more than ``error_threshold`` consecutive
+    errors are evicted and replaced with a fresh connection on release.
+    """
+
+    def __init__(self,
+                 config: SolanaConfig,
+                 size: int = 5,
+                 error_threshold: int = 3,
+                 connection_factory: Optional[Callable[[SolanaConfig], SolanaConnection]] = None):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self.config = config
+        self.size = size
+        self.error_threshold = error_threshold
+        self._factory = connection_factory or _private_connection
+        self._available: "queue.LifoQueue[SolanaConnection]" = queue.LifoQueue()
+        self._errors: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+        for _ in range(size):
+            self._available.put(self._create())
+
+    def _create(self) -> SolanaConnection:
+        connection = self._factory(self.config)
+        with self._lock:
+            self._errors[id(connection)] = 0
+        return connection
+
+    def acquire(self, timeout: Optional[float] = None) -> SolanaConnection:
+        """Take a connection from the pool, waiting until one is available."""
+        try:
+            return self._available.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("Timed out waiting for a Solana connection") from None
+
+    def release(self, connection: SolanaConnection, error: bool = False) -> None:
+        """Return a connection to the pool, recording whether its last use failed."""
+        with self._lock:
+            errors = self._errors.get(id(connection), 0) + 1 if error else 0
+            evict = errors > self.error_threshold
+            if evict:
+                self._errors.pop(id(connection), None)
+                self._evictions += 1
+            else:
+                self._errors[id(connection)] = errors
+
+        try:
+            if evict:
+                logger.warning("Evicting Solana connection after %s consecutive errors", errors)
+                connection = self._create()
+        except Exception as e:
+            # Keep the old connection rather than lose its slot; it is evicted
+            # again after its next error
+            logger.exception("Error replacing evicted Solana connection: %s", e)
+            with self._lock:
+                self._errors[id(connection)] = errors
+                self._evictions -= 1
+        finally:
+            self._available.put(connection)
+
+    def get_pool_stats(self) -> Dict[str, int]:
+        """Get pool usage statistics."""
+        available = self._available.qsize()
+        with self._lock:
+            return {
+                "size": self.size,
+                "available": available,
+                "in_use": self.size - available,
+                "erroring": sum(1 for count in self._errors.values() if count > 0),
+                "evictions": self._evictions,
+            }
+
+
+class TransactionQueue:
+    """
+    Priority queue that submits transactions in periodic batches.
+
+    A background thread flushes up to ``max_batch_size`` transactions every
+    ``flush_interval`` seconds, highest priority first, through a pooled
+    connection. Failed batch submissions are retried with exponential backoff.
+    """
+
+    def __init__(self,
+                 pool: SolanaConnectionPool,
+                 flush_interval: float = 2.0,
+                 max_batch_size: int = 10,
+                 max_attempts: int = 4,
+                 retry_base_delay: float = 0.5):
+        self.pool = pool
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+
+        self._queue: "queue.PriorityQueue[Tuple[int, int, Transaction, Keypair, Future]]" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._stats = {"submitted": 0, "failed": 0, "retries": 0, "flushes": 0}
+        self._stats_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="transaction-queue", daemon=True)
+        self._thread.start()
+
+    def enqueue(self,
+                transaction: Transaction,
+                sender: Keypair,
+                priority: TransactionPriority = TransactionPriority.NORMAL) -> "Future[Optional[str]]":
+        """
+        Queue an unsigned transaction for submission.
+
+        Returns a future resolving to the transaction signature, or None if
+        the node rejected it.
+        """
+        if self._stopped.is_set():
+            raise RuntimeError("Transaction queue is stopped")
+
+        future: "Future[Optional[str]]" = Future()
+        self._queue.put((int(priority), next(self._sequence), transaction, sender, future))
+        return future
+
+    def flush(self) -> int:
+        """Submit one batch of pending transactions. Returns the number submitted."""
+        batch = []
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if not batch:
+            return 0
+
+        # send_multiple_transactions_unconfirmed signs with a single sender
+        by_sender: Dict[int, List[Tuple[int, int, Transaction, Keypair, Future]]] = {}
+        for item in batch:
+            by_sender.setdefault(id(item[3]), []).append(item)
+
+        for items in by_sender.values():
+            self._submit_with_retry(items)
+
+        with self._stats_lock:
+            self._stats["flushes"] += 1
+        return len(batch)
+
+    def _submit_with_retry(self, items: List[Tuple[int, int, Transaction, Keypair, Future]]) -> None:
+        transactions = [item[2] for item in items]
+        sender = items[0][3]
+
+        # Sign once and resend the same bytes on retry. A batch whose response
+        # was lost may already have landed; re-signing would produce new
+        # signatures and could execute the transfers twice.
+        wire_transactions = None
+        for attempt in range(self.max_attempts):
+            connection = self.pool.acquire()
+            try:
+                if wire_transactions is None:
+                    wire_transactions = connection.sign_transactions(transactions, sender)
+                    expires_at = time.monotonic() + BLOCKHASH_VALIDITY
+                signatures = connection.send_raw_transactions(wire_transactions)
+            except Exception as e:
+                self.pool.release(connection, error=True)
+                delay = self.retry_base_delay * (2 ** attempt)
+                expired = wire_transactions is not None and time.monotonic() + delay >= expires_at
+                if attempt + 1 == self.max_attempts or expired:
+                    logger.exception("Error submitting transaction batch: %s", e)
+                    for item in items:
+                        item[4].set_exception(e)
+                    with self._stats_lock:
+                        self._stats["failed"] += len(items)
+                    return
+
+                logger.warning("Transaction batch failed, retrying in %.1fs: %s", delay, e)
+                with self._stats_lock:
+                    self._stats["retries"] += 1
+                time.sleep(delay)
+                continue
+
+            self.pool.release(connection)
+            for item, signature in zip(items, signatures):
+                item[4].set_result(signature)
+            with self._stats_lock:
+                self._stats["submitted"] += sum(1 for sig in signatures if sig is not None)
+                self._stats["failed"] += sum(1 for sig in signatures if sig is None)
+            return
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                while self.flush() == self.max_batch_size:
+                    pass
+            except Exception as e:
+                logger.exception("Error flushing transaction queue: %s", e)
+
+    def stop(self) -> None:
+        """Stop the background flusher and submit anything still queued."""
+        self._stopped.set()
+        self._thread.join()
+        while self.flush():
+            pass
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get queue and pool statistics."""
+        with self._stats_lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        stats["pending"] = self._queue.qsize()
+        stats["pool"] = self.pool.get_pool_stats()
+        return stats
@@ -4,11 +4,32 @@ convert_format_module module for data processing.
 This module provides functionality for implementing data processing functionality.
 """
 import logging
-from typing import Dict, List, Optional
+import sys
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 
 logger = logging.getLogger(__name__)
 
+_INFO = logging.INFO
 
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+# Options are keyword-only so a config dict passed positionally fails loudly
+_DATACLASS_OPTIONS = {"slots": True, "kw_only": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class ConvertResult:
+    """Result of converting one record."""
+    
+    status: str
+    data: Mapping[str, Any]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary, e.g. for JSON serialization."""
+        return {"status": self.status, "data": self.data}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ConvertFormatModule:
     """
     ConvertFormatModule class for data processing.
@@ -16,25 +37,64 @@ class ConvertFormatModule:
     This class implements functionality for implementing data processing functionality.
     """
     
-    def __init__(self, config: Optional[Dict] = None):
+    # Number of records converted per chunk in batch processing
+    batch_size: int = 1024
+    # Reject records that fail validation instead of passing them through
+    strict: bool = False
+    
+    def __post_init__(self):
         """Initialize the ConvertFormatModule."""
-        self.config = config or {}
-        logger.info(f"ConvertFormatModule initialized with config: {self.config}")
+        if not isinstance(self.batch_size, int) or self.batch_size < 1:
+            raise TypeError(f"batch_size must be a positive int, got {self.batch_size!r}")
+        logger.info(
+            "ConvertFormatModule initialized with batch_size=%s, strict=%s",
+            self.batch_size,
+            self.strict
+        )
     
-    def process(self, data: Dict) -> Dict:
+    def process(self, data: Mapping[str, Any]) -> ConvertResult:
         """Process the input data."""
-        logger.info(f"Processing data: {data}")
+        # Formatting a large record is costly even when no handler emits it
+        if logger.isEnabledFor(_INFO):
+            logger.info("Processing data: %r", data)
+        if self.strict and not self.validate(data):
+            raise ValueError("Invalid record")
         # Implementation goes here
-        result = {"status": "success", "data": data}
-        return result
+        return ConvertResult("success", data)
+    
+    def process_batch(self, items: Sequence[Mapping[str, Any]]) -> List[ConvertResult]:
+        """Process many records in chunks of ``batch_size``, logging once for the whole batch."""
+        batch_size = self.batch_size
+        validate = self.validate if self.strict else None
+        results: List[ConvertResult] = []
+        for start in range(0, len(items), batch_size):
+            chunk = items[start:start + batch_size]
+            if validate is not None:
+                for index, item in enumerate(chunk, start):
+                    if not validate(item):
+                        raise ValueError(f"Invalid record at index {index}")
+            # Implementation goes here
+            results.extend([ConvertResult("success", item) for item in chunk])
+        logger.info("Processed %d records", len(results))
+        return results
+    
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]] = None) -> "ConvertFormatModule":
+        """Create a module from a config dict, warning about and ignoring unknown keys."""
+        config = config or {}
+        names = {field.name for field in fields(cls)}
+        unknown = sorted(key for key in config if key not in names)
+        if unknown:
+            logger.warning("Ignoring unknown ConvertFormatModule config keys: %s", unknown)
+        return cls(**{key: value for key, value in config.items() if key in names})
     
     @staticmethod
-    def validate(data: Dict) -> bool:
+    def validate(data: Any) -> bool:
         """Validate the input data."""
-        # Validation logic here
-        return True
+        # Records are string-keyed mappings; field-level checks go here
+        return isinstance(data, Mapping) and all(isinstance(key, str) for key in data)
 
 
-def create_convert_format_module(config: Dict) -> ConvertFormatModule:
+def create_convert_format_module(config: Optional[Dict[str, Any]] = None) -> ConvertFormatModule:
     """Create a new ConvertFormatModule instance with the given config."""
-    return ConvertFormatModule(config)
+    return ConvertFormatModule.from_config(config)
@@ -0,0 +1,220 @@
+"""
+Hedged multi-endpoint RPC for Solana.
+
+This module sends read-only RPC calls to several endpoints at once and
+returns the first answer, cutting tail latency when a single endpoint is
+slow. Writes always go to the primary endpoint.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+from solana.publickey import PublicKey
+
+from .blockchain import SolanaConfig, SolanaConnection, pubkey_to_base58
+
+logger = logging.getLogger(__name__)
+
+# RPC methods that change state and must only be sent to the primary endpoint
+WRITE_METHODS = frozenset({"sendTransaction", "requestAirdrop"})
+
+
+class EndpointHealth:
+    """Latency and error tracking for one endpoint, with a simple circuit breaker."""
+
+    def __init__(self, alpha: float, error_threshold: float, cooldown: float):
+        self.alpha = alpha
+        self.error_threshold = error_threshold
+        self.cooldown = cooldown
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.open_until = 0.0
+
+    def record(self, latency: float, error: bool) -> None:
+        """Fold one call into the moving averages, tripping the breaker if needed."""
+        self.error_rate += self.alpha * (float(error) - self.error_rate)
+        if not error:
+            self.latency = latency if self.latency is None else (
+                self.latency + self.alpha * (latency - self.latency)
+            )
+        if self.error_rate > self.error_threshold:
+            self.open_until = time.monotonic() + self.cooldown
+            # Start over after the cooldown instead of tripping again immediately
+            self.error_rate = 0.0
+
+    @property
+    def available(self) -> bool:
+        """Whether the circuit breaker currently lets calls through."""
+        return time.monotonic() >= self.open_until
+
+
+class HedgedConnection:
+    """
+    Drop-in wrapper around several SolanaConnections to different endpoints.
+
+    Reads are sent to the ``hedge_count`` healthiest endpoints, ranked by
+    moving-average latency, and the first response wins. Endpoints whose
+    error rate exceeds ``error_threshold`` are skipped for ``cooldown``
+    seconds. Everything else, including all writes, is delegated to the
+    primary (first) connection.
+    """
+
+    def __init__(self,
+                 connections: Sequence[SolanaConnection],
+                 hedge_count: int = 2,
+                 timeout: float = 10.0,
+                 ewma_alpha: float = 0.2,
+                 error_threshold: float = 0.5,
+                 cooldown: float = 30.0):
+        if not connections:
+            raise ValueError("At least one connection is required")
+
+        self.connections = list(connections)
+        self.primary = self.connections[0]
+        self.hedge_count = hedge_count
+        self.timeout = timeout
+        self._health = [
+            EndpointHealth(ewma_alpha, error_threshold, cooldown)
+            for _ in self.connections
+        ]
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self.connections) * 4,
+            thread_name_prefix="hedged-rpc"
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.primary, name)
+
+    def call(self, method: str, params: Optional[List[Any]] = None) -> Dict[str, Any]:
+        """Send one read-only JSON-RPC call, hedged across endpoints."""
+        return self.batch_rpc([{"method": method, "params": params or []}])[0]
+
+    def batch_rpc(self, calls: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send a JSON-RPC batch, hedged across endpoints unless it contains writes."""
+        if any(call["method"] in WRITE_METHODS for call in calls):
+            return self.primary.batch_rpc(calls)
+        return self._hedged(lambda connection: connection.batch_rpc(calls))
+
+    def get_balance(self, pubkey: Optional[Union[PublicKey, str]] = None) -> int:
+        """Get balance for the given public key from the fastest endpoint."""
+        if pubkey is None:
+            if self.keypair is None:
+                raise ValueError("No keypair or public key provided")
+            pubkey = self._pubkey_str
+
+        resp = self.call("getBalance", [pubkey_to_base58(pubkey), {"commitment": self.config.commitment}])
+        result = resp.get("result")
+        value = result.get("value") if result is not None else None
+        if value is not None:
+            return value
+        logger.error("Error getting balance: %s", resp)
+        return 0
+
+    def request_airdrop(self, amount: int = 1_000_000_000) -> Optional[str]:
+        """Request an airdrop of SOL from the primary endpoint."""
+        return self.primary.request_airdrop(amount)
+
+    def get_endpoint_stats(self) -> List[Dict[str, Any]]:
+        """Get latency and health statistics for every endpoint."""
+        with self._lock:
+            return [
+                {
+                    "rpc_url": connection.config.rpc_url,
+                    "latency": health.latency,
+                    "error_rate": health.error_rate,
+                    "available": health.available,
+                }
+                for connection, health in zip(self.connections, self._health)
+            ]
+
+    def close(self) -> None:
+        """Stop the worker threads."""
+        self._executor.shutdown(wait=False)
+
+    def _select(self) -> List[int]:
+        """Pick the endpoints to hedge across: available ones first, fastest first."""
+        with self._lock:
+            ranked = sorted(
+                range(len(self.connections)),
+                key=lambda i: (
+                    not self._health[i].available,
+                    # Untried endpoints rank first so they get measured
+                    self._health[i].latency or 0.0
+                )
+            )
+        return ranked[:self.hedge_count]
+
+    def _hedged(self, request: Callable[[SolanaConnection], Any]) -> Any:
+        futures = {}
+        for index in self._select():
+            started = time.monotonic()
+            future = self._executor.submit(request, self.connections[index])
+            future.add_done_callback(
+                lambda f, index=index, started=started: self._record(index, started, f)
+            )
+            futures[future] = index
+
+        pending = set(futures)
+        error = None
+        deadline = time.monotonic() + self.timeout
+        while pending:
+            done, pending = wait(pending, timeout=deadline - time.monotonic(), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    return future.result()
+                error = future.exception()
+
+        for loser in pending:
+            loser.cancel()
+        if error is not None:
+            raise error
+        raise TimeoutError(f"No RPC endpoint answered within {self.timeout}s")
+
+    def _record(self, index: int, started: float, future) -> None:
+        if future.cancelled():
+            return
+        error = future.exception() is not None
+        if error:
+            logger.warning(
+                "RPC call to %s failed: %s",
+                self.connections[index].config.rpc_url,
+                future.exception()
+            )
+        with self._lock:
+            self._health[index].record(time.monotonic() - started, error)
+
+
+def connect_endpoints(rpc_urls: Sequence[str],
+                      keypair_path: Optional[str] = None,
+                      **kwargs: Any) -> Union[SolanaConnection, HedgedConnection]:
+    """
+    Connect to one or more RPC endpoints.
+
+    A single URL gives a plain SolanaConnection; several give a
+    HedgedConnection whose primary is the first URL. Only the primary loads
+    the keypair, since it handles every write.
+    """
+    connections = [
+        SolanaConnection(SolanaConfig(
+            rpc_url=rpc_url,
+            keypair_path=keypair_path if i == 0 else None
+        ))
+        for i, rpc_url in enumerate(rpc_urls)
+    ]
+    if len(connections) == 1:
+        return connections[0]
+    return HedgedConnection(connections, **kwargs)
+
+
+def rpc_urls_from_env(environ: Mapping[str, str],
+                      default: str = "https://api.devnet.solana.com") -> List[str]:
+    """Read RPC endpoints from SOLANA_RPC_URLS (comma-separated), falling back to SOLANA_RPC_URL."""
+    urls = [url.strip() for url in environ.get("SOLANA_RPC_URLS", "").split(",") if url.strip()]
+    return urls or [environ.get("SOLANA_RPC_URL", default)]
@@ -0,0 +1,194 @@
+"""
+QUIC transaction submission for Solana.
+
+This module keeps one persistent QUIC connection to a transaction ingestion
+endpoint and sends raw wire-format transactions on unidirectional streams,
+skipping the HTTP, JSON and base64 overhead of the sendTransaction RPC.
+"""
+import asyncio
+import logging
+import ssl
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from aioquic.asyncio import connect
+    from aioquic.quic.configuration import QuicConfiguration
+    AIOQUIC_AVAILABLE = True
+except ImportError:
+    logger.warning("aioquic library not available. QUIC submission disabled.")
+    AIOQUIC_AVAILABLE = False
+
+SOLANA_TPU_ALPN = "solana-tpu"
+MAX_CONCURRENT_STREAMS = 64
+KEEPALIVE_INTERVAL = 25.0
+# How long a submission holds its stream slot waiting for the peer's ACK
+STREAM_ACK_TIMEOUT = 2.0
+
+
+class QuicTransactionSubmitter:
+    """
+    Submitter that sends serialized transactions over a persistent QUIC connection.
+
+    The connection is opened to whichever endpoint completes its handshake
+    first, kept alive with periodic pings and re-established on failure.
+    At most ``max_concurrent_streams`` submissions are in flight at once: a
+    slot is held until the peer acknowledges the stream, or for at most
+    ``stream_timeout`` seconds, and further callers block until one frees up.
+    A submission that is not acknowledged in time is retried once on a new
+    connection before ``submit`` raises. Acknowledgement only means the
+    endpoint received the bytes, not that the transaction landed.
+    """
+
+    def __init__(self,
+                 endpoints: Sequence[Tuple[str, int]],
+                 certificate_path: Optional[str] = None,
+                 private_key_path: Optional[str] = None,
+                 alpn: str = SOLANA_TPU_ALPN,
+                 verify_server: bool = False,
+                 max_concurrent_streams: int = MAX_CONCURRENT_STREAMS,
+                 keepalive_interval: float = KEEPALIVE_INTERVAL,
+                 stream_timeout: float = STREAM_ACK_TIMEOUT):
+        if not AIOQUIC_AVAILABLE:
+            raise RuntimeError("aioquic is required for QUIC transaction submission")
+        if not endpoints:
+            raise ValueError("At least one QUIC endpoint is required")
+
+        self.endpoints: List[Tuple[str, int]] = list(endpoints)
+        self.certificate_path = certificate_path
+        self.private_key_path = private_key_path
+        self.alpn = alpn
+        self.verify_server = verify_server
+        self.max_concurrent_streams = max_concurrent_streams
+        self.keepalive_interval = keepalive_interval
+        self.stream_timeout = stream_timeout
+
+        self._connection = None
+        self._protocol = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="quic-submitter",
+            daemon=True
+        )
+        self._thread.start()
+        self._run(self._setup())
+
+    def submit(self, tx_bytes: bytes, timeout: float = 10.0) -> None:
+        """
+        Send one serialized transaction, blocking until the endpoint acknowledges its stream.
+
+        Raises TimeoutError or ConnectionError if it could not be delivered.
+        """
+        self._run(self._submit(tx_bytes), timeout)
+
+    def close(self) -> None:
+        """Close the connection and stop the background event loop."""
+        if not self._loop.is_running():
+            return
+        self._run(self._shutdown())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def _run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the submitter loop from a synchronous caller."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    async def _setup(self) -> None:
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_streams)
+        self._connect_lock = asyncio.Lock()
+        self._keepalive_task = asyncio.ensure_future(self._keepalive())
+
+    async def _shutdown(self) -> None:
+        self._keepalive_task.cancel()
+        await self._reset()
+
+    async def _submit(self, tx_bytes: bytes) -> None:
+        async with self._semaphore:
+            try:
+                await self._send(await self._get_protocol(), tx_bytes)
+            except Exception as e:
+                # Includes an ACK timeout, which points at a half-dead connection
+                logger.warning("QUIC send failed, reconnecting: %s", e)
+                await self._reset()
+                await self._send(await self._get_protocol(), tx_bytes)
+
+    async def _send(self, protocol, tx_bytes: bytes) -> None:
+        """
+        Write the transaction on a fresh unidirectional stream and wait for the peer's ACK.
+
+        The stream frames are queued before the PING, so the PING's ACK means
+        the peer has received the transaction; lost frames are retransmitted
+        by QUIC loss recovery. Raises TimeoutError after ``stream_timeout``.
+        """
+        _, writer = await protocol.create_stream(is_unidirectional=True)
+        writer.write(tx_bytes)
+        writer.write_eof()
+        await asyncio.wait_for(protocol.ping(), self.stream_timeout)
+
+    async def _get_protocol(self):
+        async with self._connect_lock:
+            if self._protocol is None:
+                self._connection, self._protocol = await self._connect_fastest()
+            return self._protocol
+
+    async def _connect_fastest(self):
+        """Handshake with every endpoint and keep the first that completes."""
+        attempts = [asyncio.ensure_future(self._connect(host, port)) for host, port in self.endpoints]
+        winner = None
+        try:
+            for attempt in asyncio.as_completed(attempts):
+                try:
+                    winner = await attempt
+                    break
+                except Exception as e:
+                    logger.warning("QUIC handshake failed: %s", e)
+        finally:
+            for attempt in attempts:
+                attempt.cancel()
+            for attempt in attempts:
+                if attempt.done() and not attempt.cancelled() and attempt.exception() is None:
+                    if attempt.result() is not winner:
+                        await attempt.result()[0].__aexit__(None, None, None)
+
+        if winner is None:
+            raise ConnectionError("Could not connect to any QUIC endpoint")
+        return winner
+
+    async def _connect(self, host: str, port: int):
+        configuration = QuicConfiguration(
+            is_client=True,
+            alpn_protocols=[self.alpn],
+            idle_timeout=self.keepalive_interval * 2,
+        )
+        if not self.verify_server:
+            configuration.verify_mode = ssl.CERT_NONE
+        if self.certificate_path:
+            configuration.load_cert_chain(self.certificate_path, self.private_key_path)
+
+        connection = connect(host, port, configuration=configuration)
+        protocol = await connection.__aenter__()
+        logger.info("QUIC connection established to %s:%s", host, port)
+        return connection, protocol
+
+    async def _reset(self) -> None:
+        connection, self._connection, self._protocol = self._connection, None, None
+        if connection is not None:
+            try:
+                await connection.__aexit__(None, None, None)
+            except Exception as e:
+                logger.warning("Error closing QUIC connection: %s", e)
+
+    async def _keepalive(self) -> None:
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            if self._protocol is None:
+                continue
+            try:
+                await asyncio.wait_for(self._protocol.ping(), self.keepalive_interval)
+            except Exception as e:
+                logger.warning("QUIC keep-alive failed, reconnecting: %s", e)
+                await self._reset()
@@ -0,0 +1,86 @@
+"""
+Persistent on-disk cache for chain state.
+
+This module stores small values that change rarely, such as registry
+lookups, under the user's home directory so repeated CLI invocations can
+skip the RPC round-trip until the entry expires.
+"""
+import base64
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".shftfdn", "cache")
+
+# Approximate Solana slot time, for expressing TTLs in slots
+SLOT_DURATION = 0.4
+
+
+def slots_to_seconds(slots: int) -> float:
+    """Convert a number of slots to an approximate duration in seconds."""
+    return slots * SLOT_DURATION
+
+
+class StateCache:
+    """
+    File-backed key-value cache with per-entry expiry.
+
+    Each entry is a JSON file named after the SHA-1 of its key, written
+    atomically so concurrent processes never read a partial entry.
+    """
+
+    def __init__(self, namespace: str, root: str = DEFAULT_CACHE_DIR):
+        self.directory = os.path.join(root, namespace)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get the value stored for a key, or None if it is missing or expired."""
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Error reading cache entry %s: %s", path, e)
+            return None
+
+        if entry.get("key") != key or entry.get("expires_at", 0) < time.time():
+            return None
+        return base64.b64decode(entry["value"])
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a value for a key, expiring after ``ttl`` seconds."""
+        entry = {
+            "key": key,
+            "expires_at": time.time() + ttl,
+            "value": base64.b64encode(value).decode("ascii"),
+        }
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(entry, f)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning("Error writing cache entry for %s: %s", key, e)
+
+    def delete(self, key: str) -> None:
+        """Remove the entry for a key, if any."""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass